@@ -0,0 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Type
+import argparse
+import csv
+import json
+import sys
+
+from cpu_sched_base import CPUSchedBase
+import cpu_sched_algos as algos
+from result_cache import ResultCache
+from workload_io import WorkloadColumns, read_workload
+
+
+@dataclass
+class SweepResult:
+    workload: str
+    algorithm: str
+    time_quantum: Optional[int]
+    processes: int
+    cpu_utilization: float
+    avg_turnaround_time: float
+    avg_waiting_time: float
+    timeline: Optional[List[Tuple[Optional[str], int, int]]] = None
+
+
+# (algorithm class name, time quantum or None)
+SweepCase = Tuple[str, Optional[int]]
+# one unit of work sent to a worker: (workload path, its columns, the cases to run against
+# it, whether to include timelines, cache directory or None)
+SweepChunk = Tuple[str, WorkloadColumns, List[SweepCase], bool, Optional[str]]
+
+UNKNOWN_ALGORITHM_ERROR = ValueError("unknown algorithm")
+
+
+def build_sched(algo: Type[CPUSchedBase], columns: WorkloadColumns, time_quantum: Optional[int]) -> CPUSchedBase:
+    if issubclass(algo, algos.RRSched):
+        return algo.from_arrays(columns.arrivals, columns.bursts, columns.priorities, columns.names, time_quantum=time_quantum)
+    return algo.from_arrays(columns.arrivals, columns.bursts, columns.priorities, columns.names)
+
+
+def run_case(
+    workload: str,
+    columns: WorkloadColumns,
+    algo: Type[CPUSchedBase],
+    time_quantum: Optional[int],
+    include_timeline: bool = False,
+    cache: Optional[ResultCache] = None,
+) -> SweepResult:
+    sched = build_sched(algo, columns, time_quantum)
+    if cache is not None:
+        cache.execute(sched, record_timeline=include_timeline)
+    else:
+        sched.execute(record_timeline=include_timeline)
+    return SweepResult(
+        workload,
+        algo.name,
+        time_quantum,
+        len(sched.processes_list),
+        sched.cpu_utilization,
+        sched.avg_turnaround_time,
+        sched.avg_waiting_time,
+        [
+            (task.process.name if task.process else None, task.start, task.end)
+            for task in sched.proc_timeline
+        ] if include_timeline else None,
+    )
+
+
+def _run_chunk(chunk: SweepChunk) -> List[SweepResult]:
+    workload, columns, cases, include_timelines, cache_directory = chunk
+    classes = {algo.__name__: algo for algo in algos.algos_lookup}
+    cache = ResultCache(cache_directory) if cache_directory is not None else None
+    return [
+        run_case(workload, columns, classes[algo_name], time_quantum, include_timelines, cache)
+        for algo_name, time_quantum in cases
+    ]
+
+
+def sweep_cases(algorithms: Iterable[Type[CPUSchedBase]], time_quanta: Sequence[int]) -> List[SweepCase]:
+    cases: List[SweepCase] = []
+    for algo in algorithms:
+        if algo not in algos.algos_lookup:
+            raise UNKNOWN_ALGORITHM_ERROR
+        if issubclass(algo, algos.RRSched):
+            cases.extend((algo.__name__, time_quantum) for time_quantum in time_quanta)
+        else:
+            cases.append((algo.__name__, None))
+    return cases
+
+
+def _chunks(
+    workloads: Dict[str, WorkloadColumns],
+    cases: List[SweepCase],
+    chunksize: int,
+    include_timelines: bool,
+    cache_directory: Optional[str],
+) -> Iterator[SweepChunk]:
+    # each workload is shipped once per chunk rather than once per case
+    for workload, columns in workloads.items():
+        for i in range(0, len(cases), chunksize):
+            yield workload, columns, cases[i:i + chunksize], include_timelines, cache_directory
+
+
+def run_sweep(
+    workloads: Dict[str, WorkloadColumns],
+    algorithms: Iterable[Type[CPUSchedBase]] = algos.algos_lookup,
+    time_quanta: Sequence[int] = (1,),
+    include_timelines: bool = False,
+    max_workers: Optional[int] = None,
+    chunksize: int = 4,
+    cache_directory: Optional[str] = None,
+) -> List[SweepResult]:
+    cases = sweep_cases(algorithms, time_quanta)
+    chunks = _chunks(workloads, cases, max(1, chunksize), include_timelines, cache_directory)
+    if max_workers == 1:
+        return [result for chunk in chunks for result in _run_chunk(chunk)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [result for results in executor.map(_run_chunk, chunks) for result in results]
+
+
+def write_results(results: List[SweepResult], stream: TextIO, format: str = "csv") -> None:
+    if format == "json":
+        json.dump([asdict(result) for result in results], stream)
+        stream.write("\n")
+        return
+    columns = [field.name for field in fields(SweepResult) if field.name != "timeline"]
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow(columns)
+    for result in results:
+        writer.writerow([getattr(result, column) for column in columns])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    kv_algos_lookup = {algo.name: algo for algo in algos.algos_lookup}
+    parser = argparse.ArgumentParser(description='CPU Scheduling Batch Runner')
+    parser.add_argument('workloads', nargs='+', help='Workload files (.csv, .npy, .npz)')
+    parser.add_argument('--algo', action='append', choices=list(kv_algos_lookup), help='CPU Scheduling Algorithm, repeatable (default: all)')
+    parser.add_argument('--quantum', type=int, nargs='+', default=[1], help='Time Quanta for Round Robin')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--chunksize', type=int, default=4, help='Cases per submitted task')
+    parser.add_argument('--timelines', action='store_true', help='Include full timelines (JSON only)')
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv', help='Output format')
+    parser.add_argument('--cache', type=str, default=None, help='Result cache directory')
+    args = parser.parse_args(argv)
+    if any(quantum <= 0 for quantum in args.quantum):
+        parser.error('--quantum must be positive')
+
+    algorithms = [kv_algos_lookup[name] for name in args.algo] if args.algo else algos.algos_lookup
+    workloads = {path: read_workload(path) for path in args.workloads}
+    results = run_sweep(workloads, algorithms, args.quantum, args.timelines, args.workers, args.chunksize, args.cache)
+    write_results(results, sys.stdout, args.format)
+
+
+if __name__ == '__main__':
+    main()
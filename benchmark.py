@@ -0,0 +1,112 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Sequence, Tuple, Type
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from cpu_sched_base import CPUSchedBase
+import cpu_sched_algos as algos
+from workload_gen import generate_workload
+from workload_io import WorkloadColumns
+
+
+@dataclass
+class BenchmarkResult:
+    algorithm: str
+    engine: str
+    processes: int
+    seconds: float
+    processes_per_second: float
+    peak_memory_bytes: Optional[int]
+    timeline_slices: int
+
+
+def build_sched(algo: Type[CPUSchedBase], columns: WorkloadColumns, time_quantum: int, engine: str) -> CPUSchedBase:
+    kwargs = {}
+    if issubclass(algo, algos.RRSched):
+        kwargs["time_quantum"] = time_quantum
+    if engine != "object":
+        kwargs["engine"] = engine
+    return algo.from_arrays(columns.arrivals, columns.bursts, columns.priorities, None, **kwargs)
+
+
+def bench_case(algo: Type[CPUSchedBase], columns: WorkloadColumns, time_quantum: int, engine: str, measure_memory: bool) -> BenchmarkResult:
+    sched = build_sched(algo, columns, time_quantum, engine)
+    start = time.perf_counter()
+    sched.execute()
+    seconds = time.perf_counter() - start
+    slices = len(sched.proc_timeline)
+    peak = None
+    if measure_memory:
+        # a second run under tracemalloc, so its overhead does not skew the timing
+        sched = build_sched(algo, columns, time_quantum, engine)
+        tracemalloc.start()
+        sched.execute()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return BenchmarkResult(algo.name, engine, len(columns), seconds, len(columns) / seconds if seconds else 0.0, peak, slices)
+
+
+def bench_cases(algorithms: Sequence[Type[CPUSchedBase]], vectorized: bool) -> Iterator[Tuple[Type[CPUSchedBase], str]]:
+    for algo in algorithms:
+        yield algo, "object"
+        if vectorized and "vectorized" in algo.ENGINES:
+            yield algo, "vectorized"
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = (10**3, 10**4, 10**5),
+    algorithms: Sequence[Type[CPUSchedBase]] = algos.algos_lookup,
+    seed: int = 0,
+    time_quantum: int = 4,
+    vectorized: bool = True,
+    measure_memory: bool = True,
+    **workload_kwargs
+) -> List[BenchmarkResult]:
+    results = []
+    for size in sizes:
+        columns = generate_workload(size, seed, **workload_kwargs)
+        for algo, engine in bench_cases(algorithms, vectorized):
+            results.append(bench_case(algo, columns, time_quantum, engine, measure_memory))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    kv_algos_lookup = {algo.name: algo for algo in algos.algos_lookup}
+    parser = argparse.ArgumentParser(description='CPU Scheduling Benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**3, 10**4, 10**5], help='Process counts')
+    parser.add_argument('--algo', action='append', choices=list(kv_algos_lookup), help='CPU Scheduling Algorithm, repeatable (default: all)')
+    parser.add_argument('--seed', type=int, default=0, help='Workload seed')
+    parser.add_argument('--quantum', type=int, default=4, help='Time Quantum for Round Robin')
+    parser.add_argument('--arrival', choices=['poisson', 'bursty'], default='poisson', help='Arrival model')
+    parser.add_argument('--burst', choices=['exponential', 'pareto', 'uniform'], default='exponential', help='Burst model')
+    parser.add_argument('--no-vectorized', action='store_true', help='Skip the vectorized engine')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak memory pass')
+    parser.add_argument('--output', type=str, default='bench_results.json', help='Results file')
+    args = parser.parse_args(argv)
+
+    algorithms = [kv_algos_lookup[name] for name in args.algo] if args.algo else algos.algos_lookup
+    results = []
+    for size in args.sizes:
+        for result in run_benchmarks([size], algorithms, args.seed, args.quantum, not args.no_vectorized, not args.no_memory, arrival=args.arrival, burst=args.burst):
+            print(f"{result.algorithm:<32} {result.engine:<10} n={result.processes:<9} {result.seconds:9.3f}s {result.processes_per_second:12.0f} proc/s", file=sys.stderr)
+            results.append(result)
+    with open(args.output, 'w') as file:
+        json.dump({
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "arrival": args.arrival,
+            "burst": args.burst,
+            "time_quantum": args.quantum,
+            "results": [asdict(result) for result in results],
+        }, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import time
+
+from cpu_sched_base import CPUSchedBase
+from process import ProcessTable
+from workload_io import WorkloadColumns
+
+
+def _frozen_column(values: array) -> memoryview:
+    return memoryview(values.tobytes()).cast('q')
+
+
+@dataclass(frozen=True)
+class ArrivalIndex:
+    # A workload parsed and stably sorted by arrival once, held in read-only
+    # columns. Every run gets its own ProcessTable copied from it, so runs on the
+    # same index never share Process state. order maps each row to its input row.
+    arrivals: memoryview
+    bursts: memoryview
+    priorities: memoryview
+    names: Optional[Tuple[str, ...]]
+    order: memoryview
+
+    @classmethod
+    def from_columns(
+        cls,
+        arrivals: Sequence[int],
+        bursts: Sequence[int],
+        priorities: Optional[Sequence[int]] = None,
+        names: Optional[Sequence[str]] = None,
+    ) -> "ArrivalIndex":
+        if len(bursts) != len(arrivals) or any(
+            column is not None and len(column) != len(arrivals) for column in (priorities, names)
+        ):
+            raise CPUSchedBase.COLUMN_LENGTH_MISMATCH_ERROR
+        # the table copies handle the column conversion, including NumPy buffers in bulk
+        table = ProcessTable.from_arrays(arrivals, bursts, priorities)
+        size = len(table)
+        arrival = table.arrival
+        if all(arrival[i] <= arrival[i + 1] for i in range(size - 1)):
+            order = array('q', range(size))
+            columns = (table.arrival, table.burst, table.priority)
+        else:
+            order = array('q', sorted(range(size), key=arrival.__getitem__))
+            columns = tuple(array('q', (column[i] for i in order)) for column in (table.arrival, table.burst, table.priority))
+            if names is None:
+                # default names follow the input rows, not the sorted ones
+                names = [f"P{i+1}" for i in order]
+            else:
+                names = [names[i] for i in order]
+        return cls(*(_frozen_column(column) for column in columns), None if names is None else tuple(names), _frozen_column(order))
+
+    @classmethod
+    def from_workload(cls, columns: WorkloadColumns) -> "ArrivalIndex":
+        return cls.from_columns(columns.arrivals, columns.bursts, columns.priorities, columns.names)
+
+    def __len__(self) -> int:
+        return len(self.arrivals)
+
+    def table(self) -> ProcessTable:
+        # fresh per-run state: the columns are copied in bulk
+        return ProcessTable.from_arrays(self.arrivals, self.bursts, self.priorities, self.names)
+
+
+@dataclass
+class ComparisonResult:
+    algorithm: str
+    params: Dict[str, Any]
+    cpu_utilization: float
+    avg_turnaround_time: float
+    avg_waiting_time: float
+    avg_response_time: float
+    makespan: int
+    seconds: float
+    sched: CPUSchedBase = field(repr=False, compare=False)
+
+
+def compare(index: ArrivalIndex, scheds: Iterable[CPUSchedBase], record_timeline: bool = False) -> List[ComparisonResult]:
+    # runs each (empty) scheduler on its own copy of the index; seconds covers only
+    # loading and executing, since parsing and sorting happened once in the index
+    results = []
+    for sched in scheds:
+        start = time.perf_counter()
+        sched.load_table(index.table())
+        sched.execute(record_timeline)
+        seconds = time.perf_counter() - start
+        metrics = sched.metrics
+        results.append(ComparisonResult(
+            sched.name,
+            sched.params,
+            sched.cpu_utilization,
+            sched.avg_turnaround_time,
+            sched.avg_waiting_time,
+            metrics.response.mean,
+            sched.current_time,
+            seconds,
+            sched,
+        ))
+    return results
+
+
+COMPARISON_COLUMNS = (
+    ("Algorithm", "algorithm"),
+    ("CPU Util %", "cpu_utilization"),
+    ("Avg Turnaround", "avg_turnaround_time"),
+    ("Avg Waiting", "avg_waiting_time"),
+    ("Avg Response", "avg_response_time"),
+    ("Makespan", "makespan"),
+    ("Seconds", "seconds"),
+)
+
+
+def comparison_rows(results: Sequence[ComparisonResult]) -> List[List[str]]:
+    # one row of display strings per algorithm, in COMPARISON_COLUMNS order
+    rows = []
+    for result in results:
+        name = result.algorithm
+        if "time_quantum" in result.params:
+            name += f" (q={result.params['time_quantum']})"
+        rows.append([
+            name,
+            f"{result.cpu_utilization * 100:.2f}",
+            f"{result.avg_turnaround_time:.2f}",
+            f"{result.avg_waiting_time:.2f}",
+            f"{result.avg_response_time:.2f}",
+            str(result.makespan),
+            f"{result.seconds:.3f}",
+        ])
+    return rows
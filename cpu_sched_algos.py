@@ -1,20 +1,28 @@
-from typing import Deque, Iterable, List, Optional
-import bisect
+from abc import abstractmethod
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Type
 from collections import deque
+from dataclasses import dataclass
 
 from process_timeline import Process
 from cpu_sched_base import CPUSchedBase
+from ready_queue import ReadyQueue, HeapReadyQueue, FifoReadyQueue
 
 
 class FCFSSched(CPUSchedBase):
-    def __init__(self, processes: Iterable[Process] = []) -> None:
-        super().__init__(processes)
+    ENGINES = ("object", "vectorized")
+
+    def __init__(self, processes: Iterable[Process] = [], engine: str = "object") -> None:
+        super().__init__(processes, engine)
     
     @classmethod
     @property
     def name(self) -> str:
         return "First Come First Serve"
 
+    def _vectorized_dispatch(self, arrivals, bursts, priorities):
+        import vectorized_engine
+        return vectorized_engine.fcfs_dispatch(arrivals, bursts)
+
     def _update(self):
         self.skip_to_next_arrival()
         while self._arrived_procs:
@@ -22,9 +30,11 @@ class FCFSSched(CPUSchedBase):
 
 
 class SJFSched(CPUSchedBase):
-    def __init__(self, processes: Iterable[Process] = []) -> None:
-        super().__init__(processes)
-        self.__procs_list: List[Process] = []
+    ENGINES = ("object", "vectorized")
+
+    def __init__(self, processes: Iterable[Process] = [], ready_queue_type: Type[ReadyQueue] = HeapReadyQueue, engine: str = "object") -> None:
+        super().__init__(processes, engine)
+        self.__ready_queue: ReadyQueue = ready_queue_type(lambda x: x.burst)
 
     @classmethod
     @property
@@ -33,21 +43,28 @@ class SJFSched(CPUSchedBase):
     
     def _ready(self) -> None:
         super()._ready()
-        self.__procs_list = []
+        self.__ready_queue.clear()
+
+    def _vectorized_dispatch(self, arrivals, bursts, priorities):
+        import vectorized_engine
+        return vectorized_engine.nonpreemptive_dispatch(arrivals, bursts, bursts)
+
+    def _ready_queues(self) -> List[ReadyQueue]:
+        return [self.__ready_queue]
 
     def _update(self):
-        if not self.__procs_list:
+        if not self.__ready_queue:
             self.skip_to_next_arrival()
         while self._arrived_procs:
-            bisect.insort(self.__procs_list, self._arrived_procs.popleft(), key=lambda x: x.burst)
-        if self.__procs_list:
-            self.process(-1, self.__procs_list.pop(0))
+            self.__ready_queue.push(self._arrived_procs.popleft())
+        if self.__ready_queue:
+            self.process(-1, self.__ready_queue.pop())
 
 
 class SRTFSched(CPUSchedBase):
-    def __init__(self, processes: Iterable[Process] = []) -> None:
+    def __init__(self, processes: Iterable[Process] = [], ready_queue_type: Type[ReadyQueue] = HeapReadyQueue) -> None:
         super().__init__(processes)
-        self.__procs_list: List[Process] = []
+        self.__ready_queue: ReadyQueue = ready_queue_type(lambda x: x.burst_modified)
     
     @classmethod
     @property
@@ -56,18 +73,35 @@ class SRTFSched(CPUSchedBase):
     
     def _ready(self) -> None:
         super()._ready()
-        self.__procs_list = []
+        self.__ready_queue.clear()
+
+    def _ready_queues(self) -> List[ReadyQueue]:
+        return [self.__ready_queue]
 
     def _update(self):
-        if not self.__procs_list:
+        if not self.__ready_queue:
             self.skip_to_next_arrival()
         while self._arrived_procs:
-            bisect.insort(self.__procs_list, self._arrived_procs.popleft(), key=lambda x: x.burst_modified)
-        if self.__procs_list:
-            process = self.__procs_list.pop(0)
-            is_finished = self.process(self.time_to_next_arrival() or -1, process)
+            self.__ready_queue.push(self._arrived_procs.popleft())
+        if self.__ready_queue:
+            process = self.__ready_queue.pop()
+            is_finished = self.process(self.__time_to_preemption(process), process)
             if not is_finished:
-                bisect.insort(self.__procs_list, process, key=lambda x: x.burst_modified)
+                self.__ready_queue.push(process)
+
+    def __time_to_preemption(self, process: Process) -> int:
+        # An arrival preempts only if its burst is below what process has left by
+        # then, i.e. if it would finish before process does; ties stay with process.
+        # Arrivals passed over here are queued at the next update, so each one is
+        # looked at about once however long the process runs. -1 runs to completion.
+        now = self.current_time
+        completion = now + process.burst_modified
+        for arrival in self.upcoming_arrivals():
+            if arrival.arrival >= completion:
+                break
+            if arrival.arrival + arrival.burst_modified < completion:
+                return arrival.arrival - now
+        return -1
 
 class RRSched(CPUSchedBase):
     def __init__(self, time_quantum: int, processes: Iterable[Process] = []) -> None:
@@ -75,22 +109,58 @@ class RRSched(CPUSchedBase):
         self.time_quantum = time_quantum
         self.__procs_queue: Deque[Process] = deque()
         self.__process: Optional[Process] = None
+        self.__cycle_cooldown: int = 0
     
     @classmethod
     @property
     def name(self) -> str:
         return "Round Robin"
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {"time_quantum": self.time_quantum}
     
     def _ready(self) -> None:
         super()._ready()
         self.__procs_queue = deque()
         self.__process = None
+        self.__cycle_cooldown = 0
+
+    def __skip_full_cycles(self) -> bool:
+        # Runs whole rounds arithmetically while no arrival can join the queue
+        # and no process can finish; the rotation order is unchanged by them.
+        if self.__cycle_cooldown:
+            self.__cycle_cooldown -= 1
+            return False
+        cycle_length = len(self.__procs_queue) + (1 if self.__process else 0)
+        if not cycle_length:
+            return False
+        next_arrival = self.time_to_next_arrival()
+        max_repeats = None if next_arrival is None else next_arrival // (cycle_length * self.time_quantum)
+        if max_repeats is not None and max_repeats < 1:
+            return False
+        cycle = list(self.__procs_queue)
+        if self.__process:
+            cycle.append(self.__process)
+        repeats = (min(process.burst_modified for process in cycle) - 1) // self.time_quantum
+        if max_repeats is not None:
+            repeats = min(repeats, max_repeats)
+        if repeats < 1:
+            # a process finishes within this round; retry once it has been dispatched
+            self.__cycle_cooldown = cycle_length
+            return False
+        self.process_cycle(cycle, self.time_quantum, repeats)
+        self.__procs_queue = deque(cycle[:-1])
+        self.__process = cycle[-1]
+        return True
     
     def _update(self):
         if not self.__procs_queue and not self.__process:
             self.skip_to_next_arrival()
         while self._arrived_procs:
             self.__procs_queue.append(self._arrived_procs.popleft())
+        if self.time_quantum > 0 and self.__skip_full_cycles():
+            return
         if self.__procs_queue:
             if self.__process:
                 self.__procs_queue.append(self.__process)
@@ -101,9 +171,11 @@ class RRSched(CPUSchedBase):
                 self.__process = None
 
 class PNPSched(CPUSchedBase):
-    def __init__(self, processes: Iterable[Process] = []) -> None:
-        super().__init__(processes)
-        self.__procs_list: List[Process] = []
+    ENGINES = ("object", "vectorized")
+
+    def __init__(self, processes: Iterable[Process] = [], ready_queue_type: Type[ReadyQueue] = HeapReadyQueue, engine: str = "object") -> None:
+        super().__init__(processes, engine)
+        self.__ready_queue: ReadyQueue = ready_queue_type(lambda x: x.priority)
     
     @classmethod
     @property
@@ -112,20 +184,27 @@ class PNPSched(CPUSchedBase):
     
     def _ready(self) -> None:
         super()._ready()
-        self.__procs_list = []
+        self.__ready_queue.clear()
+
+    def _vectorized_dispatch(self, arrivals, bursts, priorities):
+        import vectorized_engine
+        return vectorized_engine.nonpreemptive_dispatch(arrivals, bursts, priorities)
+
+    def _ready_queues(self) -> List[ReadyQueue]:
+        return [self.__ready_queue]
 
     def _update(self):
-        if not self.__procs_list:
+        if not self.__ready_queue:
             self.skip_to_next_arrival()
         while self._arrived_procs:
-            bisect.insort(self.__procs_list, self._arrived_procs.popleft(), key=lambda x: x.priority)
-        if self.__procs_list:
-            self.process(-1, self.__procs_list.pop(0))
+            self.__ready_queue.push(self._arrived_procs.popleft())
+        if self.__ready_queue:
+            self.process(-1, self.__ready_queue.pop())
 
 class PPSched(CPUSchedBase):
-    def __init__(self, processes: Iterable[Process] = []) -> None:
+    def __init__(self, processes: Iterable[Process] = [], ready_queue_type: Type[ReadyQueue] = HeapReadyQueue) -> None:
         super().__init__(processes)
-        self.__procs_list: List[Process] = []
+        self.__ready_queue: ReadyQueue = ready_queue_type(lambda x: x.priority)
     
     @classmethod
     @property
@@ -134,15 +213,304 @@ class PPSched(CPUSchedBase):
     
     def _ready(self) -> None:
         super()._ready()
-        self.__procs_list = []
+        self.__ready_queue.clear()
+
+    def _ready_queues(self) -> List[ReadyQueue]:
+        return [self.__ready_queue]
 
     def _update(self):
-        if not self.__procs_list:
+        if not self.__ready_queue:
             self.skip_to_next_arrival()
         while self._arrived_procs:
-            bisect.insort(self.__procs_list, self._arrived_procs.popleft(), key=lambda x: x.priority)
-        if self.__procs_list:
-            process = self.__procs_list[0]
-            is_finished = self.process(self.time_to_next_arrival() or -1, process)
+            self.__ready_queue.push(self._arrived_procs.popleft())
+        if self.__ready_queue:
+            process = self.__ready_queue.peek()
+            is_finished = self.process(self.__time_to_preemption(process), process)
             if is_finished:
-                self.__procs_list.pop(0)
+                self.__ready_queue.pop()
+
+    def __time_to_preemption(self, process: Process) -> int:
+        # like SRTFSched: runs until the first arrival with a strictly better priority
+        now = self.current_time
+        completion = now + process.burst_modified
+        priority = process.priority
+        for arrival in self.upcoming_arrivals():
+            if arrival.arrival >= completion:
+                break
+            if arrival.priority < priority:
+                return arrival.arrival - now
+        return -1
+
+
+
+@dataclass(frozen=True)
+class LevelConfig:
+    INVALID_LEVEL_ERROR = ValueError("policy must be rr, fcfs, sjf or priority and time_quantum must be positive")
+
+    policy: str = "rr"
+    time_quantum: int = 4
+
+    def __post_init__(self) -> None:
+        if self.policy not in ("rr", "fcfs", "sjf", "priority") or self.time_quantum <= 0:
+            raise LevelConfig.INVALID_LEVEL_ERROR
+
+    def make_queue(self, ready_queue_type: Type[ReadyQueue]) -> ReadyQueue:
+        if self.policy == "sjf":
+            return ready_queue_type(lambda x: x.burst_modified)
+        if self.policy == "priority":
+            return ready_queue_type(lambda x: x.priority)
+        return FifoReadyQueue()
+
+
+DEFAULT_LEVELS: Tuple[LevelConfig, ...] = (LevelConfig("rr", 4), LevelConfig("rr", 8), LevelConfig("fcfs"))
+
+
+class MultilevelSchedBase(CPUSchedBase):
+    # Level 0 is the highest. Bit i of the bitmap is set while level i has ready
+    # processes, so the highest non-empty level is its lowest set bit.
+    NO_LEVELS_ERROR = ValueError("at least one level is required")
+
+    def __init__(
+        self,
+        processes: Iterable[Process] = [],
+        levels: Optional[Sequence[LevelConfig]] = None,
+        ready_queue_type: Type[ReadyQueue] = HeapReadyQueue,
+    ) -> None:
+        super().__init__(processes)
+        self.levels: Tuple[LevelConfig, ...] = tuple(DEFAULT_LEVELS if levels is None else levels)
+        if not self.levels:
+            raise MultilevelSchedBase.NO_LEVELS_ERROR
+        self.__queues: List[ReadyQueue] = [level.make_queue(ready_queue_type) for level in self.levels]
+        self.__bitmap: int = 0
+        self.__process: Optional[Process] = None
+        self.__process_level: int = 0
+        self.__expired: Optional[Tuple[Process, int]] = None
+        self.__quantum_used: Dict[Process, int] = {}
+        self._level_of: Dict[Process, int] = {}
+
+    def _ready(self) -> None:
+        super()._ready()
+        for queue in self.__queues:
+            queue.clear()
+        self.__bitmap = 0
+        self.__process = None
+        self.__process_level = 0
+        self.__expired = None
+        self.__quantum_used = {}
+        self._level_of = {}
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {"levels": [[level.policy, level.time_quantum] for level in self.levels]}
+
+    def _ready_queues(self) -> List[ReadyQueue]:
+        return list(self.__queues)
+
+    def _top_level(self) -> Optional[int]:
+        if not self.__bitmap:
+            return None
+        return (self.__bitmap & -self.__bitmap).bit_length() - 1
+
+    def _enqueue(self, process: Process, level: int, front: bool = False) -> None:
+        if self._level_of.get(process) != level:
+            # quantum usage only carries over while a process stays on its level
+            self.__quantum_used.pop(process, None)
+        self._level_of[process] = level
+        if front:
+            self.__queues[level].push_front(process)
+        else:
+            self.__queues[level].push(process)
+        self.__bitmap |= 1 << level
+        self._on_wait(process, level)
+
+    def _dequeue(self, level: int, process: Optional[Process] = None) -> Process:
+        queue = self.__queues[level]
+        if process is None:
+            process = queue.pop()
+        else:
+            queue.remove(process)
+        if not queue:
+            self.__bitmap &= ~(1 << level)
+        return process
+
+    def _is_queued(self, process: Process, level: int) -> bool:
+        return process in self.__queues[level]
+
+    def _drain(self, level: int) -> List[Process]:
+        processes = []
+        while self.__bitmap & (1 << level):
+            processes.append(self._dequeue(level))
+        return processes
+
+    def _move_running(self, level: int) -> None:
+        if self.__process is not None:
+            self.__process_level = level
+            self._level_of[self.__process] = level
+            self.__quantum_used[self.__process] = 0
+
+    @abstractmethod
+    def _entry_level(self, process: Process) -> int:
+        pass
+
+    def _expired_level(self, level: int) -> int:
+        return level
+
+    def _on_wait(self, process: Process, level: int) -> None:
+        pass
+
+    def _handle_events(self) -> None:
+        pass
+
+    def _update(self):
+        if not self.__bitmap and self.__process is None and self.__expired is None:
+            self.skip_to_next_arrival()
+        while self._arrived_procs:
+            process = self._arrived_procs.popleft()
+            self._enqueue(process, self._entry_level(process))
+        if self.__expired is not None:
+            # like RRSched, a process whose quantum expired queues behind that instant's arrivals
+            self._enqueue(*self.__expired)
+            self.__expired = None
+        self._handle_events()
+        top = self._top_level()
+        if self.__process is not None and top is not None and top < self.__process_level:
+            # preempted by a higher level: resume first within its own level later
+            self._enqueue(self.__process, self.__process_level, front=True)
+            self.__process = None
+            top = self._top_level()
+        if self.__process is None:
+            if top is None:
+                return
+            self.__process_level = top
+            self.__process = self._dequeue(top)
+        process = self.__process
+        level = self.levels[self.__process_level]
+        process_time = process.burst_modified
+        if level.policy == "rr":
+            process_time = min(process_time, level.time_quantum - self.__quantum_used.get(process, 0))
+        bound = self.time_to_next_event()
+        if bound is not None and bound > 0:
+            process_time = min(process_time, bound)
+        if self.process(process_time, process):
+            self.__quantum_used.pop(process, None)
+            self._level_of.pop(process, None)
+            self.__process = None
+        elif level.policy == "rr":
+            used = self.__quantum_used.get(process, 0) + process_time
+            self.__quantum_used[process] = used
+            if used >= level.time_quantum:
+                self.__quantum_used[process] = 0
+                self.__process = None
+                self.__expired = (process, self._expired_level(self.__process_level))
+
+
+class MLQSched(MultilevelSchedBase):
+    # a process stays on the level given by its priority, clamped to the last level
+    @classmethod
+    @property
+    def name(self) -> str:
+        return "Multilevel Queue"
+
+    def _entry_level(self, process: Process) -> int:
+        return min(max(process.priority, 0), len(self.levels) - 1)
+
+
+class MLFQSched(MultilevelSchedBase):
+    INVALID_INTERVAL_ERROR = ValueError("boost_interval and aging_threshold must be positive")
+
+    def __init__(
+        self,
+        processes: Iterable[Process] = [],
+        levels: Optional[Sequence[LevelConfig]] = None,
+        boost_interval: Optional[int] = None,
+        aging_threshold: Optional[int] = None,
+        ready_queue_type: Type[ReadyQueue] = HeapReadyQueue,
+    ) -> None:
+        if any(interval is not None and interval <= 0 for interval in (boost_interval, aging_threshold)):
+            raise MLFQSched.INVALID_INTERVAL_ERROR
+        super().__init__(processes, levels, ready_queue_type)
+        self.boost_interval = boost_interval
+        self.aging_threshold = aging_threshold
+        self.__next_boost: Optional[int] = boost_interval
+        # (enqueue time, stamp, process) in enqueue order, so the oldest waiter is always first
+        self.__waits: Deque[Tuple[int, int, Process]] = deque()
+        self.__wait_stamps: Dict[Process, int] = {}
+        self.__stamp: int = 0
+
+    @classmethod
+    @property
+    def name(self) -> str:
+        return "Multilevel Feedback Queue"
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {**super().params, "boost_interval": self.boost_interval, "aging_threshold": self.aging_threshold}
+
+    def _ready(self) -> None:
+        super()._ready()
+        self.__next_boost = self.boost_interval
+        self.__waits = deque()
+        self.__wait_stamps = {}
+        self.__stamp = 0
+
+    def _entry_level(self, process: Process) -> int:
+        return 0
+
+    def _expired_level(self, level: int) -> int:
+        return min(level + 1, len(self.levels) - 1)
+
+    def _on_wait(self, process: Process, level: int) -> None:
+        if self.aging_threshold is None:
+            return
+        if level == 0:
+            self.__wait_stamps.pop(process, None)
+        else:
+            self.__stamp += 1
+            self.__wait_stamps[process] = self.__stamp
+            self.__waits.append((self.current_time, self.__stamp, process))
+
+    def __is_waiting(self, stamp: int, process: Process) -> bool:
+        level = self._level_of.get(process)
+        return self.__wait_stamps.get(process) == stamp and level is not None and self._is_queued(process, level)
+
+    def __next_aging(self) -> Optional[int]:
+        while self.__waits and not self.__is_waiting(self.__waits[0][1], self.__waits[0][2]):
+            self.__waits.popleft()
+        if not self.__waits:
+            return None
+        return self.__waits[0][0] + self.aging_threshold
+
+    def _time_to_next_event(self) -> Optional[int]:
+        events = [self.__next_boost]
+        if self.aging_threshold is not None:
+            events.append(self.__next_aging())
+        events = [event - self.current_time for event in events if event is not None]
+        return min(events) if events else None
+
+    def _handle_events(self) -> None:
+        now = self.current_time
+        if self.__next_boost is not None and self.__next_boost <= now:
+            for level in range(1, len(self.levels)):
+                for process in self._drain(level):
+                    self.__wait_stamps.pop(process, None)
+                    self._enqueue(process, 0)
+            self._move_running(0)
+            self.__next_boost = (now // self.boost_interval + 1) * self.boost_interval
+        if self.aging_threshold is not None:
+            while (next_aging := self.__next_aging()) is not None and next_aging <= now:
+                _, _, process = self.__waits.popleft()
+                level = self._level_of[process]
+                self.__wait_stamps.pop(process, None)
+                self._enqueue(self._dequeue(level, process), level - 1)
+
+
+algos_lookup: List[Type[CPUSchedBase]] = [
+    FCFSSched,
+    SJFSched,
+    SRTFSched,
+    RRSched,
+    PNPSched,
+    PPSched,
+    MLQSched,
+    MLFQSched,
+]
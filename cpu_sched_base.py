@@ -1,28 +1,108 @@
 from abc import ABC, abstractmethod
-from typing import Deque, Iterable, List, Optional, Set
+from array import array
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 import bisect
+import copy
+import math
+import operator
+import time
 from collections import deque
+from itertools import islice
+from dataclasses import dataclass
 
-from process import Process
+from process import Process, ProcessTable
 from process_timeline import ProcessTimeline
+from ready_queue import ReadyQueue
+from run_metrics import RunMetrics
+from sched_stats import SchedStats
+from timeline_sinks import TimelineSink
+import workload_io
+
+# process_stats needs NumPy, so it is only imported when stats are asked for
+if TYPE_CHECKING:
+    from process_stats import ProcessStats
+
+
+@dataclass(frozen=True)
+class SchedCheckpoint:
+    # a detached copy of a paused scheduler; restore() and fork() copy it again, so it can be reused
+    time: int
+    state: Dict[str, Any]
+    timeline: ProcessTimeline
 
 
 class CPUSchedBase(ABC):
     NEGATIVE_PROCESS_TIME_ERROR = ValueError("process_time cannot be negative")
     PROCESS_TIME_AND_PROCESS_NONE_ERROR = ValueError("process_time and process cannot both be None")
+    COLUMN_LENGTH_MISMATCH_ERROR = ValueError("workload columns must all have the same length")
+    UNSUPPORTED_ENGINE_ERROR = ValueError("engine is not supported by this scheduler")
+    CYCLE_FINISHES_PROCESS_ERROR = ValueError("process_cycle cannot finish a process")
+    TIMELINE_NOT_RECORDED_ERROR = RuntimeError("proc_timeline was not recorded for this execution")
+    UNORDERED_ARRIVALS_ERROR = ValueError("streamed processes must be given in arrival order")
+    NOT_PAUSED_ERROR = RuntimeError("resume needs an execution paused by execute(until=...), restore() or fork()")
+    PAST_ARRIVAL_ERROR = ValueError("a process inserted into a paused execution cannot arrive before current_time")
+    CHECKPOINT_ONLINE_ERROR = RuntimeError("an online execution cannot be checkpointed")
+    # instance attributes that are not part of the execution state
+    __UNCOPIED_STATE = ("stats", "process", "process_cycle", "_CPUSchedBase__proc_timeline", "_CPUSchedBase__sink")
+    __PROCESS_LISTS = ("_CPUSchedBase__init_procs", "_CPUSchedBase__incoming_procs")
+    ENGINES: Tuple[str, ...] = ("object",)
     
-    def __init__(self, processes: Iterable[Process] = []) -> None:
+    def __init__(self, processes: Iterable[Process] = [], engine: str = "object") -> None:
+        if engine not in self.ENGINES:
+            raise CPUSchedBase.UNSUPPORTED_ENGINE_ERROR
+        self.engine = engine
+        self.stats: Optional[SchedStats] = None
+        # min, max and quantile sketches in metrics cost several times the plain sums, so
+        # they are opt-in here; metrics-only and online runs always keep them
+        self.track_distributions: bool = False
         self.__init_procs: List[Process] = []
+        # rows loaded from each ProcessTable, so rewind can reset whole tables at once
+        self.__tables: Dict[ProcessTable, int] = {}
         self.__proc_id_ctr: int = 0
         self.__unfinished_procs: Set[Process] = set()
         self.__incoming_procs: Deque[Process] = deque()
+        # arrival of the head of __incoming_procs, kept so the hot path skips the Process view
+        self.__next_arrival: Optional[int] = None
+        # online mode pulls arrivals lazily from here and hands finished processes to __completed
+        self.__arrival_source: Optional[Iterator[Process]] = None
+        self.__last_arrival: Optional[int] = None
+        self.__completed: Optional[Deque[Process]] = None
         self._arrived_procs: Deque[Process] = deque()
         self.__proc_timeline: ProcessTimeline = ProcessTimeline()
+        # slices are also streamed here while a run is in progress, when given
+        self.__sink: Optional[TimelineSink] = None
         self.__time: int = 0
+        self.__metrics: RunMetrics = RunMetrics(distributions=False)
+        self.__distributions: bool = False
+        self.__record_timeline: bool = True
         self.__has_executed: bool = False
         self.__is_executing: bool = False
-        for process in processes:
-            self.insert_process(process)
+        self.__is_paused: bool = False
+        self.load_many(processes)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrivals: Sequence[int],
+        bursts: Sequence[int],
+        priorities: Optional[Sequence[int]] = None,
+        names: Optional[Sequence[str]] = None,
+        *args,
+        **kwargs
+    ) -> "CPUSchedBase":
+        if len(bursts) != len(arrivals) or any(
+            column is not None and len(column) != len(arrivals) for column in (priorities, names)
+        ):
+            raise CPUSchedBase.COLUMN_LENGTH_MISMATCH_ERROR
+        sched = cls(*args, **kwargs)
+        # load_table skips the sort and per-process bookkeeping when arrivals are sorted
+        sched.load_table(ProcessTable.from_arrays(arrivals, bursts, priorities, names))
+        return sched
+
+    @classmethod
+    def from_file(cls, path: str, *args, **kwargs) -> "CPUSchedBase":
+        columns = workload_io.read_workload(path)
+        return cls.from_arrays(columns.arrivals, columns.bursts, columns.priorities, columns.names, *args, **kwargs)
     
     def __was_executed(func):
         def wrapper(self, *args, **kwargs):
@@ -31,10 +111,14 @@ class CPUSchedBase(ABC):
             return func(self, *args, **kwargs)
         return wrapper
         
+    @staticmethod
+    def __outside_update_error(name: str) -> RuntimeError:
+        return RuntimeError(f"{name} should be only called inside the _update() virtual method")
+
     def __is_inside_update(func):
         def wrapper(self, *args, **kwargs):
             if not self.__is_executing:
-                raise RuntimeError(f"{func.__name__} should be only called inside the _update() virtual method")
+                raise CPUSchedBase.__outside_update_error(func.__name__)
             return func(self, *args, **kwargs)
         return wrapper
 
@@ -48,67 +132,280 @@ class CPUSchedBase(ABC):
     @property
     @__was_executed
     def avg_turnaround_time(self) -> float:
-        return sum(process.turnaround_time for process in self.__init_procs) / len(self.__init_procs)
+        return self.__metrics.turnaround.mean
 
     @property
     @__was_executed
     def avg_waiting_time(self) -> float:
-        return sum(process.waiting_time for process in self.__init_procs) / len(self.__init_procs)
+        return self.__metrics.waiting.mean
+
+    @property
+    @__was_executed
+    def metrics(self) -> RunMetrics:
+        return self.__metrics
+
+    @property
+    @__was_executed
+    def process_stats(self) -> "ProcessStats":
+        # percentile and fairness statistics over processes_list, computed on demand with NumPy
+        from process_stats import ProcessStats
+        if all(rows == len(table) for table, rows in self.__tables.items()):
+            return ProcessStats.from_tables(self.__tables)
+        return ProcessStats.from_processes(self.__init_procs)
     
     @property
     @__was_executed
     def proc_timeline(self) -> ProcessTimeline:
+        if not self.__record_timeline:
+            raise CPUSchedBase.TIMELINE_NOT_RECORDED_ERROR
         return self.__proc_timeline
     
     @property
     def processes_list(self) -> List[Process]:
         return self.__init_procs
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        # the JSON-serializable constructor arguments that can change the schedule
+        return {}
     
     @property
     @__was_executed
     def cpu_utilization(self) -> float:
-        return sum(process.burst for process in self.__init_procs)/self.__time
+        return self.__metrics.busy_time/self.__time
     
     @__is_outside_update
     def insert_process(self, process: Process) -> None:
+        if self.__is_paused:
+            self.__insert_paused(process)
         process.process_id = self.__proc_id_ctr
         bisect.insort(self.__init_procs, process, key=lambda x: x.arrival)
+        self.__tables[process.table] = self.__tables.get(process.table, 0) + 1
         self.__proc_id_ctr += 1
+
+    def __insert_paused(self, process: Process) -> None:
+        # a paused execution picks the process up as a future arrival
+        if process.arrival < self.__time:
+            raise CPUSchedBase.PAST_ARRIVAL_ERROR
+        process.rewind()
+        bisect.insort(self.__incoming_procs, process, key=lambda x: x.arrival)
+        self.__next_arrival = self.__incoming_procs[0].arrival
+        self.__unfinished_procs.add(process)
+
+    @__is_outside_update
+    def load_many(self, processes: Iterable[Process]) -> None:
+        new_procs = list(processes)
+        standalone = [process for process in new_procs if len(process.table) == 1 and process.table not in self.__tables]
+        if len(standalone) > 1:
+            # processes built on their own move into one shared table, so rewind can reset it whole
+            ProcessTable.adopt(standalone)
+        if self.__is_paused:
+            for process in new_procs:
+                self.__insert_paused(process)
+        for process_id, process in enumerate(new_procs, self.__proc_id_ctr):
+            process.process_id = process_id
+            self.__tables[process.table] = self.__tables.get(process.table, 0) + 1
+        self.__proc_id_ctr += len(new_procs)
+        # a stable sort keeps insertion order among equal arrivals, same as repeated insort
+        new_procs.sort(key=lambda x: x.arrival)
+        if self.__init_procs:
+            new_procs = sorted(self.__init_procs + new_procs, key=lambda x: x.arrival)
+        self.__init_procs = new_procs
+    
+    @__is_outside_update
+    def load_table(self, table: ProcessTable) -> None:
+        # every row of a table already sorted by arrival, such as one from an ArrivalIndex,
+        # without the per-process sort and bookkeeping of load_many
+        arrivals = table.arrival
+        if self.__is_paused or any(map(operator.gt, arrivals, islice(arrivals, 1, None))):
+            self.load_many(table.processes)
+            return
+        first = self.__proc_id_ctr
+        table.process_id[:] = array('q', range(first, first + len(table)))
+        self.__proc_id_ctr += len(table)
+        self.__tables[table] = self.__tables.get(table, 0) + len(table)
+        if self.__init_procs:
+            self.__init_procs = sorted(self.__init_procs + table.processes, key=lambda x: x.arrival)
+        else:
+            self.__init_procs = list(table.processes)
     
     @__is_outside_update
     def rewind(self) -> None:
         self.__unfinished_procs.clear()
         self.__incoming_procs.clear()
+        self.__next_arrival = None
         self._arrived_procs.clear()
         self.__proc_timeline.clear()
         self.__time = 0
-        for process in self.__init_procs:
-            process.rewind()
+        self.__is_paused = False
+        if all(rows == len(table) for table, rows in self.__tables.items()):
+            for table in self.__tables:
+                table.rewind()
+        else:
+            for process in self.__init_procs:
+                process.rewind()
+
+    @__is_outside_update
+    def load_result(self, starts: Sequence[int], ends: Sequence[int], end_time: int, timeline: Optional[ProcessTimeline] = None) -> None:
+        # marks the scheduler as executed with a known outcome, such as a cached one;
+        # starts and ends follow processes_list
+        if len(starts) != len(self.__init_procs) or len(ends) != len(self.__init_procs):
+            raise CPUSchedBase.COLUMN_LENGTH_MISMATCH_ERROR
+        self.__distributions = self.track_distributions
+        self._ready()
+        for process, start, end in zip(self.__init_procs, starts, ends):
+            process.start = start
+            process.end = end
+            process.burst_modified = 0
+            self.__metrics.add(process)
+        self.__incoming_procs.clear()
+        self.__next_arrival = None
+        self.__unfinished_procs.clear()
+        self.__time = end_time
+        self.__record_timeline = timeline is not None
+        if timeline is not None:
+            self.__proc_timeline = timeline
+        self.__has_executed = True
+
+    @__is_outside_update
+    def checkpoint(self) -> SchedCheckpoint:
+        if self.__arrival_source is not None:
+            raise CPUSchedBase.CHECKPOINT_ONLINE_ERROR
+        state, timeline = self.__copy_state(
+            {key: value for key, value in self.__dict__.items() if key not in CPUSchedBase.__UNCOPIED_STATE},
+            self.__proc_timeline,
+        )
+        return SchedCheckpoint(self.__time, state, timeline)
+
+    @__is_outside_update
+    def restore(self, checkpoint: SchedCheckpoint) -> None:
+        # the restored execution gets fresh copies of every Process
+        self.__load_checkpoint(checkpoint)
+
+    def __load_checkpoint(self, checkpoint: SchedCheckpoint) -> None:
+        state, timeline = self.__copy_state(checkpoint.state, checkpoint.timeline)
+        self.__dict__.update(state)
+        self.__proc_timeline = timeline
+
+    @__is_outside_update
+    def fork(self, checkpoint: Optional[SchedCheckpoint] = None) -> "CPUSchedBase":
+        # an independent scheduler at checkpoint (or at the current state) that shares
+        # the recorded timeline prefix copy-on-write; stats are not carried over
+        checkpoint = checkpoint or self.checkpoint()
+        fork = type(self).__new__(type(self))
+        fork.stats = None
+        fork.__sink = None
+        fork.__load_checkpoint(checkpoint)
+        return fork
+
+    @staticmethod
+    def __copy_state(state: Dict[str, Any], timeline: ProcessTimeline) -> Tuple[Dict[str, Any], ProcessTimeline]:
+        # deepcopy covers subclass ready queues too; the long process lists are rebuilt
+        # from the process copies instead, and the timeline is forked rather than copied
+        memo: Dict[int, Any] = {}
+        processes = {process: process.__deepcopy__(memo) for process in state["_CPUSchedBase__init_procs"]}
+        for process in state["_CPUSchedBase__unfinished_procs"]:
+            if process not in processes:
+                processes[process] = process.__deepcopy__(memo)
+        copied = copy.deepcopy(
+            {key: value for key, value in state.items() if key not in CPUSchedBase.__PROCESS_LISTS}, memo
+        )
+        copied["_CPUSchedBase__init_procs"] = [processes[process] for process in state["_CPUSchedBase__init_procs"]]
+        copied["_CPUSchedBase__incoming_procs"] = deque(processes[process] for process in state["_CPUSchedBase__incoming_procs"])
+        return copied, timeline.fork(processes)
     
-    @__is_inside_update
     def __queue_arrived_processes(self) -> None:
-        next_arrival = self.time_to_next_arrival()
-        while next_arrival is not None and next_arrival <= 0:
-            self._arrived_procs.append(self.__incoming_procs.popleft())
-            next_arrival = self.time_to_next_arrival()
+        # the head of the arrival stream is the next arrival event; every event due
+        # by now is delivered to the policy in one batch before its update
+        time, arrived = self.__time, self._arrived_procs
+        if self.__arrival_source is not None:
+            self.__peek_incoming()
+        while self.__next_arrival is not None and self.__next_arrival <= time:
+            arrived.append(self.__pop_incoming())
+            if self.__arrival_source is not None:
+                self.__peek_incoming()
+
+    def __pop_incoming(self) -> Process:
+        process = self.__incoming_procs.popleft()
+        self.__next_arrival = self.__incoming_procs[0].arrival if self.__incoming_procs else None
+        return process
+
+    def __peek_incoming(self) -> Optional[Process]:
+        if not self.__incoming_procs and self.__arrival_source is not None:
+            process = next(self.__arrival_source, None)
+            if process is None:
+                self.__arrival_source = None
+                return None
+            self.__admit(process)
+        return self.__incoming_procs[0] if self.__incoming_procs else None
+
+    def __admit(self, process: Process) -> None:
+        if self.__last_arrival is not None and process.arrival < self.__last_arrival:
+            raise CPUSchedBase.UNORDERED_ARRIVALS_ERROR
+        self.__last_arrival = process.arrival
+        process.process_id = self.__proc_id_ctr
+        self.__proc_id_ctr += 1
+        process.rewind()
+        self.__unfinished_procs.add(process)
+        if not self.__incoming_procs:
+            self.__next_arrival = process.arrival
+        self.__incoming_procs.append(process)
     
-    @__is_inside_update
+    # The methods below run on every update, so they check __is_executing inline
+    # rather than paying for the __is_inside_update wrapper call.
+
     def skip_to_next_arrival(self) -> None:
-        next_arrival_time = self.time_to_next_arrival()
-        if not self._arrived_procs and self.__incoming_procs and next_arrival_time is not None and next_arrival_time >= 0:
+        if not self.__is_executing:
+            raise CPUSchedBase.__outside_update_error("skip_to_next_arrival")
+        # an idle gap is jumped in one step, however long it is
+        if self._arrived_procs or (self.__next_arrival is None and self.__peek_incoming() is None):
+            return
+        next_arrival_time = self.__next_arrival - self.__time
+        if next_arrival_time >= 0:
             if next_arrival_time > 0:
                 self.process(next_arrival_time, None)
-            while self.__incoming_procs and self.__incoming_procs[0].arrival == self.__time:
-                self._arrived_procs.append(self.__incoming_procs.popleft())
+            self.__queue_arrived_processes()
     
-    @__is_inside_update
+    @property
+    def current_time(self) -> int:
+        return self.__time
+
     def time_to_next_arrival(self) -> Optional[int]:
-        if not self.__incoming_procs:
+        if not self.__is_executing:
+            raise CPUSchedBase.__outside_update_error("time_to_next_arrival")
+        if self.__next_arrival is None and self.__peek_incoming() is None:
             return None
-        return self.__incoming_procs[0].arrival - self.__time
+        return self.__next_arrival - self.__time
+
+    def upcoming_arrivals(self) -> Iterator[Process]:
+        # the processes still to arrive, in arrival order; an online source is only
+        # read as far as the caller iterates, and what it reads stays queued
+        if not self.__is_executing:
+            raise CPUSchedBase.__outside_update_error("upcoming_arrivals")
+        yield from self.__incoming_procs
+        while self.__arrival_source is not None:
+            process = next(self.__arrival_source, None)
+            if process is None:
+                self.__arrival_source = None
+                return
+            self.__admit(process)
+            yield process
+
+    def time_to_next_event(self) -> Optional[int]:
+        # the nearer of the next arrival and the policy's own next event
+        next_arrival = self.time_to_next_arrival()
+        next_event = self._time_to_next_event()
+        if next_arrival is None or (next_event is not None and next_event < next_arrival):
+            return next_event
+        return next_arrival
+
+    def _time_to_next_event(self) -> Optional[int]:
+        # policies with timed events (boosts, aging) report the time until the next one
+        return None
     
-    @__is_inside_update
     def process(self, _process_time: int = -1, process: Optional[Process] = None) -> bool:
+        if not self.__is_executing:
+            raise CPUSchedBase.__outside_update_error("process")
         if _process_time == -1 and process is None:
             raise CPUSchedBase.PROCESS_TIME_AND_PROCESS_NONE_ERROR
         if _process_time < 0 and _process_time != -1:
@@ -116,16 +413,34 @@ class CPUSchedBase(ABC):
         is_finished = False
         process_time = _process_time
         if process is not None:
-            if _process_time == -1:
-                process_time = process.burst_modified
-            process_time = min(process_time, process.burst_modified)
+            remaining = process.burst_modified
+            if _process_time == -1 or remaining < process_time:
+                process_time = remaining
             is_finished = process.process(self.__time, process_time)
             if is_finished:
-                self.__unfinished_procs.remove(process)
-        self.__proc_timeline.add_task(process, self.__time, self.__time + process_time)
+                self.__finish(process)
+        if self.__record_timeline:
+            self.__proc_timeline.add_task(process, self.__time, self.__time + process_time)
+        if self.__sink is not None:
+            self.__sink.add_task(process, self.__time, self.__time + process_time)
         self.__time += process_time
         return is_finished
 
+    def process_cycle(self, processes: Sequence[Process], process_time: int, repeats: int) -> None:
+        if not self.__is_executing:
+            raise CPUSchedBase.__outside_update_error("process_cycle")
+        if process_time <= 0 or repeats <= 0:
+            raise CPUSchedBase.NEGATIVE_PROCESS_TIME_ERROR
+        if any(process.burst_modified <= process_time * repeats for process in processes):
+            raise CPUSchedBase.CYCLE_FINISHES_PROCESS_ERROR
+        for i, process in enumerate(processes):
+            process.process(self.__time + i * process_time, process_time * repeats)
+        if self.__record_timeline:
+            self.__proc_timeline.add_cycle(processes, self.__time, process_time, repeats)
+        if self.__sink is not None:
+            self.__sink.add_cycle(processes, self.__time, process_time, repeats)
+        self.__time += process_time * repeats * len(processes)
+
     @classmethod
     @property
     @abstractmethod
@@ -135,17 +450,242 @@ class CPUSchedBase(ABC):
     def _ready(self) -> None:
         self.rewind()
         self.__incoming_procs = deque(self.__init_procs)
+        self.__next_arrival = self.__init_procs[0].arrival if self.__init_procs else None
         self.__unfinished_procs = set(self.__init_procs)
+        self.__last_arrival = self.__init_procs[-1].arrival if self.__init_procs else None
+        self.__metrics = RunMetrics(distributions=self.__distributions)
         self.__has_executed = False
+
+    def __finish(self, process: Process) -> None:
+        self.__unfinished_procs.remove(process)
+        self.__metrics.add(process)
+        if self.__completed is not None:
+            self.__completed.append(process)
     
-    def execute(self) -> None:
-        self._ready()
-        while self.__unfinished_procs:
+    def __row_groups(self) -> List[Tuple[ProcessTable, Any, Any]]:
+        # (table, rows, positions in processes_list) for each table the processes live in;
+        # slices stand for whole columns when one table holds processes_list in order
+        import numpy as np
+        procs = self.__init_procs
+        if len(self.__tables) == 1:
+            table = next(iter(self.__tables))
+            if table.processes == procs:
+                return [(table, slice(None), slice(None))]
+            return [(table, np.fromiter((process.row for process in procs), np.intp, len(procs)), slice(None))]
+        groups: Dict[ProcessTable, Tuple[List[int], List[int]]] = {}
+        for position, process in enumerate(procs):
+            rows, positions = groups.setdefault(process.table, ([], []))
+            rows.append(process.row)
+            positions.append(position)
+        return [(table, np.array(rows, np.intp), np.array(positions, np.intp)) for table, (rows, positions) in groups.items()]
+
+    def __execute_vectorized(self, stats: Optional[SchedStats]) -> None:
+        # the schedule is computed from the table columns and written back into them
+        # in bulk, and the timeline and metrics are built from the same arrays
+        import numpy as np
+        procs = self.__init_procs
+        if not procs:
+            return
+        start = time.perf_counter()
+        groups = self.__row_groups()
+
+        def gather(column: str) -> np.ndarray:
+            values = np.empty(len(procs), np.int64)
+            for table, rows, positions in groups:
+                values[positions] = np.frombuffer(getattr(table, column), np.int64)[rows]
+            return values
+
+        arrivals, bursts = gather("arrival"), gather("burst")
+        order, starts = self._vectorized_dispatch(arrivals, bursts, gather("priority"))
+        order, starts = np.asarray(order, np.intp), np.asarray(starts, np.int64)
+        ends = starts + bursts[order]
+        process_starts = np.empty(len(procs), np.int64)
+        process_starts[order] = starts
+        process_ends = process_starts + bursts
+        for table, rows, positions in groups:
+            np.frombuffer(table.start, np.int64)[rows] = process_starts[positions]
+            np.frombuffer(table.end, np.int64)[rows] = process_ends[positions]
+            np.frombuffer(table.remaining, np.int64)[rows] = 0
+        turnaround = process_ends - arrivals
+        waiting = turnaround - bursts
+        self.__metrics.add_columns(turnaround.tolist(), waiting.tolist(), (process_starts - arrivals).tolist(), int(bursts.sum()))
+        if stats is not None:
+            stats.phase_times["vectorized"] += time.perf_counter() - start
+        if self.__record_timeline or self.__sink is not None or stats is not None:
+            # an idle row goes before every dispatch that starts after the previous one ends
+            previous_ends = np.concatenate(([self.__time], ends[:-1]))
+            gaps = starts > previous_ends
+            task_rows = np.arange(len(order)) + np.cumsum(gaps)
+            row_starts = np.empty(len(order) + int(gaps.sum()), np.int64)
+            row_ends = np.empty_like(row_starts)
+            row_owners = np.full_like(row_starts, -1)
+            row_starts[task_rows], row_ends[task_rows], row_owners[task_rows] = starts, ends, order
+            gap_rows = task_rows[gaps] - 1
+            row_starts[gap_rows], row_ends[gap_rows] = previous_ends[gaps], starts[gaps]
+            owners = [procs[owner] if owner >= 0 else None for owner in row_owners.tolist()]
+            if self.__record_timeline:
+                self.__proc_timeline.add_tasks(owners, array('q', row_starts.tobytes()), array('q', row_ends.tobytes()))
+            if self.__sink is not None or stats is not None:
+                for process, row_start, row_end in zip(owners, row_starts.tolist(), row_ends.tolist()):
+                    if self.__sink is not None:
+                        self.__sink.add_task(process, row_start, row_end)
+                    if stats is not None:
+                        stats.record_slice(row_start, process, row_end - row_start, process is not None)
+        self.__time = int(ends[-1])
+        self.__incoming_procs.clear()
+        self.__next_arrival = None
+        self.__unfinished_procs.clear()
+
+    def _ready_queues(self) -> List[ReadyQueue]:
+        return []
+
+    def __instrument(self, stats: SchedStats) -> None:
+        # instance attributes shadow the class methods only while stats are enabled
+        process, process_cycle = self.process, self.process_cycle
+
+        def timed_process(_process_time: int = -1, proc: Optional[Process] = None) -> bool:
+            start_time, start = self.__time, time.perf_counter()
+            is_finished = process(_process_time, proc)
+            stats.phase_times["dispatch"] += time.perf_counter() - start
+            stats.record_slice(start_time, proc, self.__time - start_time, is_finished)
+            return is_finished
+
+        def timed_process_cycle(processes: Sequence[Process], process_time: int, repeats: int) -> None:
+            start_time, start = self.__time, time.perf_counter()
+            process_cycle(processes, process_time, repeats)
+            stats.phase_times["dispatch"] += time.perf_counter() - start
+            stats.record_cycle(start_time, processes, process_time, repeats)
+
+        self.process = timed_process
+        self.process_cycle = timed_process_cycle
+        for ready_queue in self._ready_queues():
+            ready_queue.instrument(stats)
+        if stats.profile:
+            import cProfile
+            stats.profiler = cProfile.Profile()
+            stats.profiler.enable()
+
+    def __uninstrument(self, stats: SchedStats) -> None:
+        if stats.profiler is not None:
+            stats.profiler.disable()
+        for ready_queue in self._ready_queues():
+            ready_queue.uninstrument()
+        del self.process
+        del self.process_cycle
+
+    def __run_updates(self, until: float) -> None:
+        while self.__unfinished_procs and self.__time < until:
             self.__is_executing = True
             self.__queue_arrived_processes()
             self._update()
             self.__is_executing = False
-        self.__has_executed = True
+
+    def __run_update_timed(self, stats: SchedStats) -> None:
+        self.__is_executing = True
+        start = time.perf_counter()
+        self.__queue_arrived_processes()
+        queued = time.perf_counter()
+        self._update()
+        stats.phase_times["queue_arrivals"] += queued - start
+        stats.phase_times["update"] += time.perf_counter() - queued
+        stats.updates += 1
+        self.__is_executing = False
+
+    def __run_updates_timed(self, stats: SchedStats, until: float) -> None:
+        while self.__unfinished_procs and self.__time < until:
+            self.__run_update_timed(stats)
+
+    def __run_updates_online(self, stats: Optional[SchedStats]) -> Iterator[Process]:
+        completed = self.__completed
+        while self.__unfinished_procs or self.__peek_incoming() is not None:
+            if stats is None:
+                self.__is_executing = True
+                self.__queue_arrived_processes()
+                self._update()
+                self.__is_executing = False
+            else:
+                self.__run_update_timed(stats)
+            while completed:
+                yield completed.popleft()
+
+    def __run(
+        self,
+        record_timeline: bool,
+        arrivals: Optional[Iterable[Process]],
+        until: Optional[int],
+        resume: bool = False,
+        sink: Optional[TimelineSink] = None,
+        distributions: bool = False,
+    ) -> Iterator[Process]:
+        stats = self.stats
+        if stats is not None:
+            if not resume:
+                stats.reset()
+            self.__instrument(stats)
+        try:
+            if not resume:
+                self.__record_timeline = record_timeline
+                self.__sink = sink
+                self.__distributions = distributions
+                start = time.perf_counter()
+                self._ready()
+                if stats is not None:
+                    stats.phase_times["ready"] += time.perf_counter() - start
+            if arrivals is not None:
+                self.__arrival_source = iter(arrivals)
+                self.__completed = deque()
+                yield from self.__run_updates_online(stats)
+            else:
+                if self.engine == "vectorized" and until is None and not resume:
+                    self.__execute_vectorized(stats)
+                until = math.inf if until is None else until
+                if stats is None:
+                    self.__run_updates(until)
+                else:
+                    self.__run_updates_timed(stats, until)
+        finally:
+            self.__arrival_source = None
+            self.__completed = None
+            if stats is not None:
+                self.__uninstrument(stats)
+        self.__is_paused = bool(self.__unfinished_procs)
+        self.__has_executed = not self.__is_paused
+        if self.__sink is not None:
+            # a paused run may still extend its last slice, so that one is held back
+            self.__sink.flush(final=not self.__is_paused)
+            if not self.__is_paused:
+                self.__sink = None
+
+    def execute(
+        self,
+        record_timeline: bool = True,
+        until: Optional[int] = None,
+        sink: Optional[TimelineSink] = None,
+        distributions: Optional[bool] = None,
+    ) -> None:
+        # with until, execution pauses at the first update boundary at or after that time;
+        # slices go to sink as well as the timeline, and resume() keeps streaming to it.
+        # distributions defaults to track_distributions, or on without a timeline
+        if distributions is None:
+            distributions = self.track_distributions or not record_timeline
+        for _ in self.__run(record_timeline, None, until, sink=sink, distributions=distributions):
+            pass
+
+    @__is_outside_update
+    def resume(self, until: Optional[int] = None) -> None:
+        if not self.__is_paused:
+            raise CPUSchedBase.NOT_PAUSED_ERROR
+        for _ in self.__run(self.__record_timeline, None, until, resume=True):
+            pass
+
+    def execute_online(self, arrivals: Iterable[Process], record_timeline: bool = False, sink: Optional[TimelineSink] = None) -> Iterator[Process]:
+        # arrivals are pulled one ahead of the clock and yielded as they finish; none
+        # are kept afterwards, so memory follows the live ready set. Any preloaded
+        # processes act as the head of the trace, and metrics cover the whole run.
+        return self.__run(record_timeline, arrivals, None, sink=sink, distributions=True)
+
+    def _vectorized_dispatch(self, arrivals, bursts, priorities) -> Tuple[Sequence[int], Sequence[int]]:
+        raise CPUSchedBase.UNSUPPORTED_ENGINE_ERROR
 
     @abstractmethod
     @__is_inside_update
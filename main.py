@@ -1,30 +1,23 @@
-from typing import Any, Callable, List, Optional, TypeVar
-import questionary
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple, TypeVar, Union
 import re
 import argparse
-from rich.console import Console
-from rich.table import Table
-from rich.highlighter import ReprHighlighter
-from rich.text import Text
-from rich import box
+import sys
 
 from cpu_sched_base import CPUSchedBase
 import cpu_sched_algos as algos
-from process import Process
+from process import Process, ProcessTable
+from process_timeline import ProcessTimeline
+from smp_sched import PLACEMENTS, SMPSched
 
-console = Console()
+if TYPE_CHECKING:
+    from process_stats import ProcessStats
 
-algos_lookup: List[CPUSchedBase] = [
-    algos.FCFSSched,
-    algos.SJFSched,
-    algos.SRTFSched,
-    algos.RRSched,
-    algos.PNPSched,
-    algos.PPSched,
-]
+algos_lookup = algos.algos_lookup
 
 kv_algos_lookup = {algo.name: algo for algo in algos_lookup}
 
+PRIORITY_ALGOS = (algos.PNPSched, algos.PPSched, algos.MLQSched)
+
 # COMMANDLINE ARGS
 
 parser = argparse.ArgumentParser(description='CPU Scheduling Solver')
@@ -33,29 +26,16 @@ parser.add_argument('--arrival', type=str, help='Arrival Times')
 parser.add_argument('--burst', type=str, help='Burst Times')
 parser.add_argument('--priority', type=str, help='Priorities')
 parser.add_argument('--quantum', type=int, help='Time Quantum')
+parser.add_argument('--cache', type=str, help='Result Cache Directory')
+parser.add_argument('--cores', type=int, default=1, help='Number of simulated cores')
+parser.add_argument('--placement', choices=PLACEMENTS, default='least_work', help='How arrivals are placed on cores')
+parser.add_argument('--batch', action='store_true', help='Non-interactive mode: print results and exit')
+parser.add_argument('--workload', type=str, help='Workload file (.csv, .npy, .npz), or - for CSV on stdin (batch mode)')
+parser.add_argument('--format', choices=['json', 'csv'], default='json', help='Batch output format')
+parser.add_argument('--timeline', action='store_true', help='Include the timeline in batch output')
+parser.add_argument('--stats', action='store_true', help='Include percentile and fairness statistics (needs NumPy)')
+parser.add_argument('--compare', action='store_true', help='Run every algorithm on the workload and compare them side by side')
 
-args = parser.parse_args()
-vargs = vars(args)
-
-# SELECT ALGORITHM
-console.clear()
-
-SelectedAlgo = None
-
-if args.algo:
-    if args.algo not in kv_algos_lookup:
-        console.print('Invalid algorithm')
-        exit(1)
-    SelectedAlgo = kv_algos_lookup[args.algo]
-else:
-    SelectedAlgo = questionary.select(
-        "Select an algorithm",
-        choices=[questionary.Choice(algo.name, algo) for algo in algos_lookup],
-    ).ask()
-
-
-# SELECT PROCESSES
-console.clear()
 
 def multinum_parser(text: Optional[str]) -> Optional[List[int]]:
     if text is None:
@@ -75,25 +55,6 @@ def variable_multinum_validator(length: int, allow_zeroes=False) -> Callable[[st
         return multinum_validator(allow_zeroes)(text) and len(multinum_parser(text)) == length
     return wrapper
 
-def get_input(prompt: str, meta_prompt: str, validator: Callable[[str], bool], parser: Callable[[str], Any]) -> Optional[Any]:
-    if vargs and bool(text := vargs.get(prompt)):
-        if validator(text):
-            return parser(text)
-        else:
-            console.print(f'Invalid {meta_prompt}')
-            exit(1)
-    else:
-        return parser(questionary.text(
-            f"Input {meta_prompt}. Press Ctrl+C to exit.\n", 
-            validate=validator
-        ).ask())
-
-def get_multinum_input(prompt: str, meta_prompt: str, validator: Callable[[str], bool]) -> Optional[List[int]]:
-    return get_input(prompt, meta_prompt, validator, multinum_parser)
-
-def get_num_input(prompt, meta_prompt: str, validator: Callable[[str], bool]) -> Optional[int]:
-    return get_input(prompt, meta_prompt, validator, int)
-
 
 T = TypeVar('T')
 
@@ -102,75 +63,352 @@ def gen_on_condition(bool: bool, generator: Callable[[], T], default) -> T:
         return generator()
     return default
 
-time_quantum = gen_on_condition(
-    SelectedAlgo == algos.RRSched, 
-    lambda: get_num_input('quantum', 'Time Quantum', lambda x: (isinstance(x, int) or bool(re.match(r'^\d+$', x))) and int(x) >= 0),
-    0
-)
-arrival_times = get_multinum_input('arrival', 'Arrival Times (space-separated)', multinum_validator(True))
-burst_times = get_multinum_input('burst', 'Burst Times (space-separated)',variable_multinum_validator(len(arrival_times)))
-priorities = gen_on_condition(
-    SelectedAlgo in [algos.PNPSched, algos.PPSched], 
-    lambda: get_multinum_input('priority', 'Priorities (space-separated)', variable_multinum_validator(len(arrival_times), True)),
-    [0 for _ in range(len(arrival_times))]
-)
-
-processes = []
-
-for i, (arrival, burst, priorities) in enumerate(zip(arrival_times, burst_times, priorities)):
-    processes.append(Process(f'P{i+1}', arrival, burst, priorities))
-
-# EXECUTE ALGORITHM
-console.clear()
-
-cpualgo: algos.CPUSchedBase = algos.RRSched(time_quantum, processes) if SelectedAlgo == algos.RRSched else SelectedAlgo(processes)
-
-def print_cpu_sched_table(console: Console, algo: CPUSchedBase):
-    table = Table(
-        title=algo.name, 
-        safe_box=False,
-        show_lines=True,
-        box=box.ROUNDED,
-        caption=f"Time Quantum: {cpualgo.time_quantum}" if isinstance(cpualgo, algos.RRSched) else None
-    )
-    table.add_column("Process ID", justify="center", style="bright_red")
-    headers = [
-        "Arrival Time",
-        "Burst Time",
-        "Ending Time",
-        "Turnaround Time",
-        "Waiting Time",
+
+def build_sched(SelectedAlgo, processes: List[Process], time_quantum: Optional[int]) -> CPUSchedBase:
+    return algos.RRSched(time_quantum, processes) if SelectedAlgo == algos.RRSched else SelectedAlgo(processes)
+
+def build_cores_sched(SelectedAlgo, processes: List[Process], time_quantum: Optional[int], cores: int, placement: str) -> Union[CPUSchedBase, SMPSched]:
+    if cores == 1:
+        return build_sched(SelectedAlgo, processes, time_quantum)
+    return SMPSched(lambda: build_sched(SelectedAlgo, [], time_quantum), cores, processes, placement)
+
+def execute(cpualgo: Union[CPUSchedBase, SMPSched], cache: Optional[str], record_timeline: bool = True) -> None:
+    if cache:
+        from result_cache import ResultCache
+        ResultCache(cache).execute(cpualgo, record_timeline)
+    else:
+        cpualgo.execute(record_timeline)
+
+
+# BATCH MODE
+
+# (arrivals, bursts, priorities, names)
+BatchColumns = Tuple[Sequence[int], Sequence[int], Sequence[int], Optional[Sequence[str]]]
+
+def column_min(column: Sequence[int]) -> int:
+    # NumPy columns reduce in bulk, where min() would box every element
+    return int(column.min()) if hasattr(column, "min") else min(column)
+
+def read_batch_columns(args: argparse.Namespace) -> BatchColumns:
+    if args.workload:
+        import workload_io
+        try:
+            if args.workload == '-':
+                columns = workload_io.read_csv_stream(sys.stdin.buffer)
+            else:
+                columns = workload_io.read_workload(args.workload)
+        except (ValueError, OSError) as error:
+            parser.error(f'--workload {args.workload}: {error}')
+        if any(column is not None and len(column) != len(columns) for column in (columns.bursts, columns.priorities, columns.names)):
+            parser.error(f'--workload {args.workload}: every column must have the same length')
+        if len(columns) and (column_min(columns.arrivals) < 0 or column_min(columns.bursts) <= 0):
+            parser.error(f'--workload {args.workload}: arrivals must not be negative and bursts must be positive')
+        return columns.arrivals, columns.bursts, columns.priorities, columns.names
+    if not args.arrival or not args.burst:
+        parser.error('--batch needs --workload or both --arrival and --burst')
+    arrival_times = multinum_parser(args.arrival)
+    if not multinum_validator(True)(args.arrival) or not variable_multinum_validator(len(arrival_times))(args.burst) or (
+        args.priority and not variable_multinum_validator(len(arrival_times), True)(args.priority)
+    ):
+        parser.error('--arrival, --burst and --priority must have the same length, with positive bursts')
+    burst_times = multinum_parser(args.burst)
+    priorities = multinum_parser(args.priority) if args.priority else [0] * len(arrival_times)
+    return arrival_times, burst_times, priorities, None
+
+def timeline_rows(timeline: ProcessTimeline) -> List[List[Any]]:
+    return [[task.process.name if task.process else None, task.start, task.end] for task in timeline]
+
+def batch_report(cpualgo: Union[CPUSchedBase, SMPSched], include_timeline: bool, include_stats: bool = False) -> Dict[str, Any]:
+    is_smp = isinstance(cpualgo, SMPSched)
+    report = {
+        "algorithm": cpualgo.name,
+        **cpualgo.params,
+        "processes": [
+            {
+                "name": process.name,
+                "arrival": process.arrival,
+                "burst": process.burst,
+                "priority": process.priority,
+                "end": process.end,
+                "turnaround_time": process.turnaround_time,
+                "waiting_time": process.waiting_time,
+                **({"core": cpualgo.core_of(process)} if is_smp else {}),
+            }
+            for process in sorted(cpualgo.processes_list, key=lambda x: x.process_id)
+        ],
+        "cpu_utilization": cpualgo.cpu_utilization,
+        "avg_turnaround_time": cpualgo.avg_turnaround_time,
+        "avg_waiting_time": cpualgo.avg_waiting_time,
+    }
+    if include_stats:
+        # process_stats imports NumPy, so plain reports skip it
+        stats = cpualgo.process_stats
+        report.update(stats.summary())
+        report["priority_stats"] = {level: level_stats.summary() for level, level_stats in stats.by_priority.items()}
+    if is_smp:
+        report["core_utilization"] = cpualgo.core_utilization
+    if include_timeline:
+        # one timeline per core on multiple cores
+        report["timeline"] = (
+            [timeline_rows(timeline) for timeline in cpualgo.core_timelines] if is_smp else timeline_rows(cpualgo.proc_timeline)
+        )
+    return report
+
+def write_batch_report(report: Dict[str, Any], stream: TextIO, format: str) -> None:
+    if format == 'json':
+        import json
+        json.dump(report, stream)
+        stream.write('\n')
+        return
+    # the process table, then a blank line and the run metrics as metric,value rows
+    import csv
+    writer = csv.writer(stream, lineterminator='\n')
+    columns = ["name", "arrival", "burst", "priority", "end", "turnaround_time", "waiting_time"]
+    if report["processes"] and "core" in report["processes"][0]:
+        columns.append("core")
+    writer.writerow(columns)
+    for process in report["processes"]:
+        writer.writerow([process[column] for column in columns])
+    writer.writerow([])
+    writer.writerow(["metric", "value"])
+    for key, value in report.items():
+        if key not in ("processes", "timeline", "priority_stats"):
+            writer.writerow([key, value])
+    for level, summary in report.get("priority_stats", {}).items():
+        for key, value in summary.items():
+            writer.writerow([f"priority_{level}_{key}", value])
+
+def compare_scheds(time_quantum: Optional[int]) -> List[CPUSchedBase]:
+    # Round Robin only joins the comparison with a time quantum
+    return [
+        build_sched(algo, [], time_quantum)
+        for algo in algos_lookup
+        if algo != algos.RRSched or time_quantum is not None
     ]
-    if isinstance(cpualgo, (algos.PNPSched, algos.PPSched)):
-        headers.insert(0, "Priority")
-    for header in headers:
-        table.add_column(header, justify="center")
-    for process in sorted(algo.processes_list, key=lambda x: x.process_id):
-        row = [
-            process.name, 
-            str(process.arrival), 
-            str(process.burst), 
-            str(process.end), 
-            str(process.turnaround_time), 
-            str(process.waiting_time)
+
+def run_compare(columns: BatchColumns, time_quantum: Optional[int]) -> List[Any]:
+    from comparison import ArrivalIndex, compare
+    return compare(ArrivalIndex.from_columns(*columns), compare_scheds(time_quantum))
+
+def write_compare_report(results: List[Any], stream: TextIO, format: str) -> None:
+    from comparison import COMPARISON_COLUMNS
+    keys = [key for _, key in COMPARISON_COLUMNS]
+    rows = [{**{key: getattr(result, key) for key in keys}, **result.params} for result in results]
+    if format == 'json':
+        import json
+        json.dump(rows, stream)
+        stream.write('\n')
+        return
+    import csv
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow(keys + ["time_quantum"])
+    for row in rows:
+        writer.writerow([row[key] for key in keys] + [row.get("time_quantum", "")])
+
+def run_batch(args: argparse.Namespace) -> None:
+    if args.compare:
+        write_compare_report(run_compare(read_batch_columns(args), args.quantum), sys.stdout, args.format)
+        return
+    if args.algo not in kv_algos_lookup:
+        parser.error('--batch needs a valid --algo')
+    SelectedAlgo = kv_algos_lookup[args.algo]
+    if SelectedAlgo == algos.RRSched and args.quantum is None:
+        parser.error('Round Robin needs --quantum')
+    processes = ProcessTable.from_arrays(*read_batch_columns(args)).processes
+    cpualgo = build_cores_sched(SelectedAlgo, processes, args.quantum, args.cores, args.placement)
+    execute(cpualgo, args.cache, args.timeline)
+    write_batch_report(batch_report(cpualgo, args.timeline, args.stats), sys.stdout, args.format)
+
+
+# INTERACTIVE MODE
+
+def run_interactive(args: argparse.Namespace) -> None:
+    import questionary
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+    from rich import box
+
+    console = Console()
+    vargs = vars(args)
+
+    # SELECT ALGORITHM
+    console.clear()
+
+    SelectedAlgo = None
+
+    if args.compare:
+        pass
+    elif args.algo:
+        if args.algo not in kv_algos_lookup:
+            console.print('Invalid algorithm')
+            exit(1)
+        SelectedAlgo = kv_algos_lookup[args.algo]
+    else:
+        SelectedAlgo = questionary.select(
+            "Select an algorithm",
+            choices=[questionary.Choice(algo.name, algo) for algo in algos_lookup],
+        ).ask()
+
+    # SELECT PROCESSES
+    console.clear()
+
+    def get_input(prompt: str, meta_prompt: str, validator: Callable[[str], bool], parser: Callable[[str], Any]) -> Optional[Any]:
+        if vargs and bool(text := vargs.get(prompt)):
+            if validator(text):
+                return parser(text)
+            else:
+                console.print(f'Invalid {meta_prompt}')
+                exit(1)
+        else:
+            return parser(questionary.text(
+                f"Input {meta_prompt}. Press Ctrl+C to exit.\n",
+                validate=validator
+            ).ask())
+
+    def get_multinum_input(prompt: str, meta_prompt: str, validator: Callable[[str], bool]) -> Optional[List[int]]:
+        return get_input(prompt, meta_prompt, validator, multinum_parser)
+
+    def get_num_input(prompt, meta_prompt: str, validator: Callable[[str], bool]) -> Optional[int]:
+        return get_input(prompt, meta_prompt, validator, int)
+
+    time_quantum = gen_on_condition(
+        args.compare or SelectedAlgo == algos.RRSched,
+        lambda: get_num_input('quantum', 'Time Quantum', lambda x: (isinstance(x, int) or bool(re.match(r'^\d+$', x))) and int(x) > 0),
+        0
+    )
+    arrival_times = get_multinum_input('arrival', 'Arrival Times (space-separated)', multinum_validator(True))
+    burst_times = get_multinum_input('burst', 'Burst Times (space-separated)',variable_multinum_validator(len(arrival_times)))
+    priorities = gen_on_condition(
+        args.compare or SelectedAlgo in PRIORITY_ALGOS,
+        lambda: get_multinum_input('priority', 'Priorities (space-separated)', variable_multinum_validator(len(arrival_times), True)),
+        [0 for _ in range(len(arrival_times))]
+    )
+
+    if args.compare:
+        from comparison import COMPARISON_COLUMNS, comparison_rows
+        console.clear()
+        results = run_compare((arrival_times, burst_times, priorities, None), time_quantum)
+        table = Table(title="Comparison", safe_box=False, show_lines=True, box=box.ROUNDED)
+        for header, _ in COMPARISON_COLUMNS:
+            table.add_column(header, justify="center", style="bright_red" if header == "Algorithm" else None)
+        for row in comparison_rows(results):
+            table.add_row(*row)
+        console.print(table)
+        questionary.press_any_key_to_continue().ask()
+        return
+
+    processes = []
+
+    for i, (arrival, burst, priorities) in enumerate(zip(arrival_times, burst_times, priorities)):
+        processes.append(Process(f'P{i+1}', arrival, burst, priorities))
+
+    # EXECUTE ALGORITHM
+    console.clear()
+
+    cpualgo = build_cores_sched(SelectedAlgo, processes, time_quantum, args.cores, args.placement)
+    is_smp = isinstance(cpualgo, SMPSched)
+
+    def print_cpu_sched_table(console: Console, algo: Union[CPUSchedBase, SMPSched]):
+        table = Table(
+            title=algo.name,
+            safe_box=False,
+            show_lines=True,
+            box=box.ROUNDED,
+            caption=f"Time Quantum: {time_quantum}" if SelectedAlgo == algos.RRSched else None
+        )
+        table.add_column("Process ID", justify="center", style="bright_red")
+        headers = [
+            "Arrival Time",
+            "Burst Time",
+            "Ending Time",
+            "Turnaround Time",
+            "Waiting Time",
         ]
-        if isinstance(cpualgo, (algos.PNPSched, algos.PPSched)):
-            row.insert(1, str(process.priority))
-        table.add_row(*row)
-    console.print(table)
-
-cpualgo.execute()
-console.print()
-if isinstance(cpualgo, algos.RRSched):
-    console.print(f"Time Quantum: {cpualgo.time_quantum}")
-print_cpu_sched_table(console, cpualgo)
-console.print()
-console.print(f"CPU Utilization: {round(cpualgo.cpu_utilization*100*1000)/1000:.2f}%")
-console.print(f"Average Turnaround Time: {round(cpualgo.avg_turnaround_time*1000)/1000:.2f}")
-console.print(f"Average Waiting Time: {round(cpualgo.avg_waiting_time*1000)/1000:.2f}")
-console.print()
-timeline_display = Text(str(cpualgo.proc_timeline))
-timeline_display.highlight_regex(r"\d+", "bright_yellow")
-timeline_display.highlight_regex(r"P\d+", "bright_red")
-console.print(timeline_display)
-questionary.press_any_key_to_continue().ask()
+        if SelectedAlgo in PRIORITY_ALGOS:
+            headers.insert(0, "Priority")
+        if is_smp:
+            headers.append("Core")
+        for header in headers:
+            table.add_column(header, justify="center")
+        for process in sorted(algo.processes_list, key=lambda x: x.process_id):
+            row = [
+                process.name,
+                str(process.arrival),
+                str(process.burst),
+                str(process.end),
+                str(process.turnaround_time),
+                str(process.waiting_time)
+            ]
+            if SelectedAlgo in PRIORITY_ALGOS:
+                row.insert(1, str(process.priority))
+            if is_smp:
+                row.append(str(algo.core_of(process)))
+            table.add_row(*row)
+        console.print(table)
+
+    def print_stats_table(console: Console, stats: "ProcessStats"):
+        table = Table(
+            title="Distribution",
+            safe_box=False,
+            show_lines=True,
+            box=box.ROUNDED,
+            caption=f"Jain's Fairness Index (slowdown): {stats.fairness:.4f}"
+        )
+        table.add_column("Metric", justify="center", style="bright_red")
+        for header in ("Mean", "P50", "P95", "P99", "Max"):
+            table.add_column(header, justify="center")
+        # per-priority rows only when there is more than one priority level
+        levels = list(stats.by_priority.items()) if len(stats.by_priority) > 1 else []
+        for label, level_stats in [("", stats)] + [(f" (priority {level})", level_stats) for level, level_stats in levels]:
+            for metric in ("turnaround", "waiting", "response", "slowdown"):
+                distribution = getattr(level_stats, metric)
+                table.add_row(
+                    f"{metric.capitalize()}{label}",
+                    *(f"{value:.2f}" for value in (distribution.mean, distribution.p50, distribution.p95, distribution.p99, distribution.max))
+                )
+        console.print(table)
+
+    execute(cpualgo, args.cache)
+    console.print()
+    if SelectedAlgo == algos.RRSched:
+        console.print(f"Time Quantum: {time_quantum}")
+    print_cpu_sched_table(console, cpualgo)
+    console.print()
+    console.print(f"CPU Utilization: {round(cpualgo.cpu_utilization*100*1000)/1000:.2f}%")
+    console.print(f"Average Turnaround Time: {round(cpualgo.avg_turnaround_time*1000)/1000:.2f}")
+    console.print(f"Average Waiting Time: {round(cpualgo.avg_waiting_time*1000)/1000:.2f}")
+    if args.stats:
+        console.print()
+        print_stats_table(console, cpualgo.process_stats)
+    timelines = cpualgo.core_timelines if is_smp else [cpualgo.proc_timeline]
+    for core, timeline in enumerate(timelines):
+        console.print()
+        if is_smp:
+            console.print(f"Core {core}: {round(cpualgo.core_utilization[core]*100*1000)/1000:.2f}% utilized")
+        for line in timeline.iter_render():
+            timeline_display = Text(line.rstrip("\n"))
+            timeline_display.highlight_regex(r"\d+", "bright_yellow")
+            timeline_display.highlight_regex(r"P\d+", "bright_red")
+            console.print(timeline_display)
+    questionary.press_any_key_to_continue().ask()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parser.parse_args(argv)
+    if args.cores < 1:
+        parser.error('--cores must be positive')
+    if args.quantum is not None and args.quantum <= 0:
+        parser.error('--quantum must be positive')
+    if args.cores > 1 and args.cache:
+        parser.error('--cache only supports a single core')
+    if args.compare and (args.cores > 1 or args.cache):
+        parser.error('--compare only supports a single core without --cache')
+    if args.batch:
+        run_batch(args)
+    else:
+        run_interactive(args)
+
+
+if __name__ == '__main__':
+    main()
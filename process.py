@@ -1,43 +1,269 @@
+from array import array
+from itertools import repeat
+from typing import List, Optional, Sequence
+import copy
+
+
+def _int64_column(values: Sequence[int]) -> array:
+    # contiguous 8-byte integer buffers (array('q'), NumPy int64) are copied in bulk
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array('q', map(int, values))
+    if view.ndim != 1 or view.itemsize != 8 or view.format not in ('q', 'l') or not view.c_contiguous:
+        return array('q', map(int, values))
+    column = array('q')
+    column.frombytes(view.cast('B'))
+    return column
+
+
+class ProcessTable:
+    # Struct-of-arrays storage for process state. Each row is exposed through one
+    # Process view, created with the row and kept in processes, so views can be
+    # compared and hashed by identity like the objects they replace.
+    __slots__ = ("names", "arrival", "burst", "remaining", "priority", "start", "end", "process_id", "processes")
+
+    def __init__(self) -> None:
+        # None stands for the default names P1, P2, ..., generated on access
+        self.names: Optional[List[str]] = []
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.remaining = array('q')
+        self.priority = array('q')
+        self.start = array('q')
+        self.end = array('q')
+        self.process_id = array('q')
+        self.processes: List[Process] = []
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrivals: Sequence[int],
+        bursts: Sequence[int],
+        priorities: Optional[Sequence[int]] = None,
+        names: Optional[Sequence[str]] = None,
+    ) -> "ProcessTable":
+        table = cls()
+        size = len(arrivals)
+        table.names = None if names is None else list(names)
+        table.arrival = _int64_column(arrivals)
+        table.burst = _int64_column(bursts)
+        table.remaining = array('q', table.burst)
+        table.priority = array('q', repeat(0, size)) if priorities is None else _int64_column(priorities)
+        table.start = array('q', [-1]) * size
+        table.end = array('q', [-1]) * size
+        table.process_id = array('q', [-1]) * size
+        table.processes = [Process._view(table, row) for row in range(size)]
+        return table
+
+    @classmethod
+    def adopt(cls, processes: Sequence["Process"]) -> "ProcessTable":
+        # moves the rows of processes out of their tables into a new one, in order;
+        # each process keeps its identity. Meant for processes built on their own,
+        # since the rows left behind no longer have a process.
+        table = cls()
+        table.names = [process.name for process in processes]
+        for column in ("arrival", "burst", "remaining", "priority", "start", "end", "process_id"):
+            setattr(table, column, array('q', [getattr(process._table, column)[process._row] for process in processes]))
+        table.processes = list(processes)
+        for row, process in enumerate(table.processes):
+            process._table = table
+            process._row = row
+        return table
+
+    def append(self, name: str, arrival: int, burst: int, priority: int = 0) -> "Process":
+        process = Process._view(self, self._add_row(name, arrival, burst, priority))
+        self.processes.append(process)
+        return process
+
+    def _add_row(self, name: str, arrival: int, burst: int, priority: int) -> int:
+        self._materialize_names()
+        self.names.append(name)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.remaining.append(burst)
+        self.priority.append(priority)
+        self.start.append(-1)
+        self.end.append(-1)
+        self.process_id.append(-1)
+        return len(self.names) - 1
+
+    def _materialize_names(self) -> None:
+        if self.names is None:
+            self.names = [f"P{row+1}" for row in range(len(self.arrival))]
+
+    def rewind(self) -> None:
+        size = len(self.arrival)
+        self.remaining[:] = self.burst
+        self.start[:] = array('q', [-1]) * size
+        self.end[:] = array('q', [-1]) * size
+
+    def __len__(self) -> int:
+        return len(self.arrival)
+
+    def __deepcopy__(self, memo: dict) -> "ProcessTable":
+        # the columns hold plain integers, so copying them is a memcpy per column
+        table = ProcessTable.__new__(ProcessTable)
+        memo[id(self)] = table
+        table.names = None if self.names is None else list(self.names)
+        for column in ("arrival", "burst", "remaining", "priority", "start", "end", "process_id"):
+            setattr(table, column, array('q', getattr(self, column)))
+        # views keep the class of the process they copy, subclasses included
+        table.processes = [type(process)._view(table, row) for row, process in enumerate(self.processes)]
+        return table
+
+
 class Process:
     ERR_TIME_PROCESSED = ValueError("time_processed must be greater than 0")
     ERR_ALREADY_FINISHED = RuntimeError("process has already finished")
     ERR_WILL_FINISH = RuntimeError("process will finish before time_processed")
     ERR_NOT_FINISHED = RuntimeError("process has not finished")
 
+    __slots__ = ("_table", "_row")
+
     def __init__(self, name: str, arrival: int, burst: int, priority: int = 0) -> None:
-        self.name = name
-        self.arrival = arrival
-        self.burst = burst
-        self.burst_modified: int = burst
-        self.priority = priority
-        self.end: int = -1
-        self.process_id: int = -1
+        # a process built on its own gets a private one-row table, which a scheduler
+        # merges with the others it loads (see ProcessTable.adopt)
+        table = ProcessTable()
+        self._table = table
+        self._row = table._add_row(name, arrival, burst, priority)
+        table.processes.append(self)
+
+    @classmethod
+    def _view(cls, table: ProcessTable, row: int) -> "Process":
+        process = cls.__new__(cls)
+        process._table = table
+        process._row = row
+        return process
+
+    def __deepcopy__(self, memo: dict) -> "Process":
+        process = copy.deepcopy(self._table, memo).processes[self._row]
+        memo[id(self)] = process
+        # attributes a subclass adds live on the object rather than in the table
+        for cls in type(self).__mro__[:type(self).__mro__.index(Process)]:
+            for slot in cls.__dict__.get("__slots__", ()):
+                if slot != "__dict__" and hasattr(self, slot):
+                    setattr(process, slot, copy.deepcopy(getattr(self, slot), memo))
+        if hasattr(self, "__dict__"):
+            process.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return process
+
+    @property
+    def table(self) -> ProcessTable:
+        return self._table
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def name(self) -> str:
+        names = self._table.names
+        return names[self._row] if names is not None else f"P{self._row+1}"
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._table._materialize_names()
+        self._table.names[self._row] = value
+
+    @property
+    def arrival(self) -> int:
+        return self._table.arrival[self._row]
+
+    @arrival.setter
+    def arrival(self, value: int) -> None:
+        self._table.arrival[self._row] = value
+
+    @property
+    def burst(self) -> int:
+        return self._table.burst[self._row]
+
+    @burst.setter
+    def burst(self, value: int) -> None:
+        self._table.burst[self._row] = value
+
+    @property
+    def burst_modified(self) -> int:
+        return self._table.remaining[self._row]
+
+    @burst_modified.setter
+    def burst_modified(self, value: int) -> None:
+        self._table.remaining[self._row] = value
+
+    @property
+    def priority(self) -> int:
+        return self._table.priority[self._row]
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        self._table.priority[self._row] = value
+
+    @property
+    def start(self) -> int:
+        return self._table.start[self._row]
+
+    @start.setter
+    def start(self, value: int) -> None:
+        self._table.start[self._row] = value
+
+    @property
+    def end(self) -> int:
+        return self._table.end[self._row]
+
+    @end.setter
+    def end(self, value: int) -> None:
+        self._table.end[self._row] = value
+
+    @property
+    def process_id(self) -> int:
+        return self._table.process_id[self._row]
+
+    @process_id.setter
+    def process_id(self, value: int) -> None:
+        self._table.process_id[self._row] = value
 
     def rewind(self) -> None:
-        self.burst_modified = self.burst
-        self.end = -1
+        table, row = self._table, self._row
+        table.remaining[row] = table.burst[row]
+        table.end[row] = -1
+        table.start[row] = -1
 
     def process(self, current_time: int, time_processed: int) -> bool:
+        table, row = self._table, self._row
+        remaining = table.remaining[row]
         if time_processed <= 0:
             raise Process.ERR_TIME_PROCESSED
-        if self.burst_modified <= 0:
+        if remaining <= 0:
             raise Process.ERR_ALREADY_FINISHED
-        if self.burst_modified < time_processed:
+        if remaining < time_processed:
             raise Process.ERR_WILL_FINISH
-        self.burst_modified = self.burst_modified - time_processed
-        if self.burst_modified <= 0:
-            self.end = current_time + self.burst_modified + time_processed
+        if table.start[row] == -1:
+            table.start[row] = current_time
+        remaining -= time_processed
+        table.remaining[row] = remaining
+        if remaining <= 0:
+            table.end[row] = current_time + remaining + time_processed
             return True
         return False
 
     @property
     def turnaround_time(self) -> int:
-        if self.end == -1:
+        table, row = self._table, self._row
+        if table.end[row] == -1:
             raise Process.ERR_NOT_FINISHED
-        return self.end - self.arrival
+        return table.end[row] - table.arrival[row]
 
     @property
     def waiting_time(self) -> int:
-        if self.end == -1:
+        table, row = self._table, self._row
+        if table.end[row] == -1:
+            raise Process.ERR_NOT_FINISHED
+        return table.end[row] - table.arrival[row] - table.burst[row]
+
+    @property
+    def response_time(self) -> int:
+        table, row = self._table, self._row
+        if table.end[row] == -1:
             raise Process.ERR_NOT_FINISHED
-        return self.turnaround_time - self.burst
+        return table.start[row] - table.arrival[row]
+
@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Tuple
+import numpy as np
+
+from process import Process, ProcessTable
+
+PERCENTILES = (50, 95, 99)
+
+# the ProcessTable columns pulled in, in the order the summaries take them
+_COLUMNS = ("arrival", "burst", "priority", "start", "end")
+
+# below this many processes per table on average, each column is gathered
+# attribute by attribute instead of indexed table by table
+_SMALL_TABLE_ROWS = 64
+
+Columns = Tuple[np.ndarray, ...]
+
+
+def _table_columns(table: ProcessTable) -> Columns:
+    # zero-copy views; they only live while the summaries are computed, since a
+    # table cannot grow while its buffers are exported
+    return tuple(np.frombuffer(getattr(table, column), dtype=np.int64) for column in _COLUMNS)
+
+
+@dataclass(frozen=True)
+class Distribution:
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> "Distribution":
+        # linear interpolation between ranks, as np.percentile does, but from one
+        # sort, which is cheaper than its partitions
+        ordered = np.sort(values)
+        ranks = np.array(PERCENTILES) / 100 * (len(ordered) - 1)
+        below = ranks.astype(np.intp)
+        above = np.minimum(below + 1, len(ordered) - 1)
+        p50, p95, p99 = (ordered[below] + (ordered[above] - ordered[below]) * (ranks - below)).tolist()
+        return cls(float(values.mean()), p50, p95, p99, float(ordered[-1]))
+
+
+@dataclass(frozen=True)
+class ProcessStats:
+    # Distributions over the finished processes of a run, computed in one
+    # vectorized pass over the ProcessTable columns. slowdown is turnaround over
+    # burst, and fairness is Jain's index of the slowdowns: 1 when every process
+    # is slowed down equally, down to 1/count when one process takes all of it.
+    NO_FINISHED_ERROR = ValueError("statistics need at least one finished process")
+
+    count: int
+    turnaround: Distribution
+    waiting: Distribution
+    response: Distribution
+    slowdown: Distribution
+    fairness: float
+    by_priority: Dict[int, "ProcessStats"] = field(default_factory=dict)
+
+    @classmethod
+    def from_tables(cls, tables: Iterable[ProcessTable]) -> "ProcessStats":
+        # every row of the tables, read straight from their buffers
+        return cls.__from_columns([_table_columns(table) for table in tables])
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[Process]) -> "ProcessStats":
+        processes = list(processes)
+        rows: Dict[ProcessTable, List[int]] = {}
+        for process in processes:
+            rows.setdefault(process.table, []).append(process.row)
+        if len(rows) * _SMALL_TABLE_ROWS > len(processes):
+            # many small tables each cost a buffer export and a fancy index, so one
+            # pass per column is cheaper
+            return cls.__from_columns([tuple(
+                np.fromiter(map(attrgetter(column), processes), dtype=np.int64, count=len(processes))
+                for column in _COLUMNS
+            )])
+        return cls.__from_columns([
+            tuple(column[np.array(table_rows, dtype=np.intp)] for column in _table_columns(table))
+            for table, table_rows in rows.items()
+        ])
+
+    @classmethod
+    def __from_columns(cls, parts: List[Columns]) -> "ProcessStats":
+        if not parts:
+            raise ProcessStats.NO_FINISHED_ERROR
+        columns = tuple(np.concatenate(column) for column in zip(*parts))
+        finished = columns[4] >= 0
+        if not finished.all():
+            columns = tuple(column[finished] for column in columns)
+        if not len(columns[0]):
+            raise ProcessStats.NO_FINISHED_ERROR
+        stats = cls.__summarize(*columns)
+        priority = columns[2]
+        # one sort groups the priority levels, each summarized over its own rows
+        order = np.argsort(priority)
+        levels = priority[order]
+        bounds = np.concatenate(([0], np.flatnonzero(levels[1:] != levels[:-1]) + 1, [len(order)]))
+        if len(bounds) == 2:
+            stats.by_priority[int(levels[0])] = replace(stats, by_priority={})
+            return stats
+        for first, last in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            rows = order[first:last]
+            stats.by_priority[int(levels[first])] = cls.__summarize(*(column[rows] for column in columns))
+        return stats
+
+    @classmethod
+    def __summarize(cls, arrival: np.ndarray, burst: np.ndarray, priority: np.ndarray, start: np.ndarray, end: np.ndarray) -> "ProcessStats":
+        turnaround = end - arrival
+        slowdown = turnaround / np.maximum(burst, 1)
+        squares = float(np.dot(slowdown, slowdown))
+        return cls(
+            len(turnaround),
+            Distribution.of(turnaround),
+            Distribution.of(turnaround - burst),
+            Distribution.of(start - arrival),
+            Distribution.of(slowdown),
+            float(slowdown.sum()) ** 2 / (len(slowdown) * squares) if squares else 1.0,
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        # flat metric -> value pairs, such as turnaround_p95, for reports
+        summary: Dict[str, Any] = {}
+        for metric in ("turnaround", "waiting", "response", "slowdown"):
+            distribution = getattr(self, metric)
+            for key in ("mean", "p50", "p95", "p99", "max"):
+                summary[f"{metric}_{key}"] = getattr(distribution, key)
+        summary["fairness"] = self.fairness
+        return summary
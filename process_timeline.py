@@ -1,5 +1,11 @@
+import bisect
+import heapq
+import operator
 import shutil
-from typing import List, Optional
+import zlib
+from array import array
+from itertools import accumulate, islice, repeat
+from typing import Dict, Iterator, List, Optional, Sequence as SequenceType, TextIO, Tuple, Union
 from dataclasses import dataclass
 from collections.abc import Sequence
 
@@ -11,46 +17,664 @@ class ProcessTask:
     start: int
     end: int
 
+# proc_indices codes besides the index of an interned process
+_IDLE = -1
+_CYCLE = -2
+
+class _Cycle:
+    __slots__ = ("pattern", "slice_length", "repeats")
+
+    def __init__(self, pattern: Tuple[int, ...], slice_length: int, repeats: int) -> None:
+        self.pattern = pattern
+        self.slice_length = slice_length
+        self.repeats = repeats
+
+    @property
+    def span(self) -> int:
+        return len(self.pattern) * self.repeats
+
+class _StandIn:
+    # a key for a process in a frozen segment, where the process itself is translated
+    __slots__ = ()
+
 class ProcessTimeline(Sequence):
     def __init__(self) -> None:
-        self.__tasks: List[ProcessTask] = []
+        # struct-of-arrays storage; ProcessTask objects are only built on access.
+        # A repeated cycle of equal-length slices is stored as one physical entry
+        # and expanded on access, so logical indices differ from physical ones.
+        self.__starts = array('q')
+        self.__ends = array('q')
+        self.__proc_indices = array('q')
+        self.__procs: List[Process] = []
+        self.__proc_lookup: Dict[Process, int] = {}
+        self.__cycles: List[_Cycle] = []
+        self.__cycle_physical = array('q')
+        self.__cycle_logical = array('q')
+        self.__length: int = 0
+        # busy time of all physical rows before each one, for O(log n) utilization queries
+        self.__busy_before = array('q')
+        # proc index -> physical rows holding its slices, built on the first query
+        self.__slice_index: Optional[Dict[int, array]] = None
+        self.__indexed_rows: int = 0
+        # Rows before __prefix_length live in a flat run of frozen segments shared with
+        # forks, each holding its own rows but the last, which the next one continues.
+        # Their processes are translated through __prefix_procs (None for identity).
+        self.__segments: Tuple[ProcessTimeline, ...] = ()
+        # logical index, start time and busy time before the first row of each segment
+        self.__segment_firsts = array('q')
+        self.__segment_starts = array('q')
+        self.__segment_busy = array('q')
+        self.__prefix_length: int = 0
+        self.__prefix_procs: Optional[Dict[Process, Process]] = None
+        # every process of the first __mapped_segments segments is a key of __prefix_procs
+        self.__mapped_segments: int = 0
+        # busy time of the prefix before this timeline's own rows, and __prefix_procs inverted
+        self.__prefix_busy: int = 0
+        self.__prefix_inverse: Optional[Dict[Process, List[Process]]] = None
         super().__init__()
 
+    def __proc_index(self, process: Optional[Process]) -> int:
+        if process is None:
+            return _IDLE
+        index = self.__proc_lookup.get(process)
+        if index is None:
+            index = len(self.__procs)
+            self.__procs.append(process)
+            self.__proc_lookup[process] = index
+        return index
+
+    def __locate(self, index: int) -> Tuple[int, int]:
+        # logical index -> (physical index, offset inside a cycle or -1)
+        j = bisect.bisect_right(self.__cycle_logical, index) - 1
+        if j < 0:
+            return index, -1
+        first = self.__cycle_logical[j]
+        span = self.__cycles[j].span
+        if index < first + span:
+            return self.__cycle_physical[j], index - first
+        return self.__cycle_physical[j] + 1 + index - first - span, -1
+
+    def __logical(self, physical: int) -> int:
+        j = bisect.bisect_left(self.__cycle_physical, physical) - 1
+        if j < 0:
+            return physical
+        return self.__cycle_logical[j] + self.__cycles[j].span + physical - self.__cycle_physical[j] - 1
+
+    def __cycle_of(self, physical: int) -> Tuple[int, _Cycle]:
+        j = bisect.bisect_left(self.__cycle_physical, physical)
+        return self.__cycle_logical[j], self.__cycles[j]
+
+    def __row(self, physical: int, offset: int) -> Tuple[int, int, int]:
+        if offset == -1:
+            return self.__proc_indices[physical], self.__starts[physical], self.__ends[physical]
+        cycle = self.__cycle_of(physical)[1]
+        start = self.__starts[physical] + offset * cycle.slice_length
+        return cycle.pattern[offset % len(cycle.pattern)], start, start + cycle.slice_length
+
+    def __iter_rows(self, lo: int, hi: int) -> Iterator[Tuple[int, int, int]]:
+        if lo >= hi:
+            return
+        physical, offset = self.__locate(lo)
+        next_cycle = bisect.bisect_left(self.__cycle_physical, physical)
+        remaining = hi - lo
+        while remaining > 0:
+            proc_index = self.__proc_indices[physical]
+            if proc_index != _CYCLE:
+                yield proc_index, self.__starts[physical], self.__ends[physical]
+                remaining -= 1
+            else:
+                cycle = self.__cycles[next_cycle]
+                next_cycle += 1
+                pattern = cycle.pattern
+                length = cycle.slice_length
+                start = self.__starts[physical]
+                for k in range(max(offset, 0), min(cycle.span, max(offset, 0) + remaining)):
+                    slice_start = start + k * length
+                    yield pattern[k % len(pattern)], slice_start, slice_start + length
+                    remaining -= 1
+            offset = -1
+            physical += 1
+
+    def __segment_bounds(self, k: int) -> Tuple[int, int]:
+        # logical rows [first, last) of segment k
+        last = self.__segment_firsts[k + 1] if k + 1 < len(self.__segments) else self.__prefix_length
+        return self.__segment_firsts[k], last
+
+    def __segment_at(self, time: int) -> int:
+        # the segment holding time, or -1 before the first one
+        return bisect.bisect_right(self.__segment_starts, time) - 1
+
+    def __iter_process_rows(self, lo: int, hi: int) -> Iterator[Tuple[Optional[Process], int, int]]:
+        mapping = self.__prefix_procs or {}
+        if lo < self.__prefix_length:
+            for k in range(bisect.bisect_right(self.__segment_firsts, lo) - 1, len(self.__segments)):
+                first, last = self.__segment_bounds(k)
+                if first >= hi:
+                    break
+                segment = self.__segments[k]
+                procs = segment.__procs
+                for proc_index, start, end in segment.__iter_rows(max(lo, first) - first, min(hi, last) - first):
+                    process = procs[proc_index] if proc_index != _IDLE else None
+                    yield mapping.get(process, process), start, end
+        procs = self.__procs
+        prefix_length = self.__prefix_length
+        for proc_index, start, end in self.__iter_rows(max(lo - prefix_length, 0), hi - prefix_length):
+            yield procs[proc_index] if proc_index != _IDLE else None, start, end
+
+    def __process_row(self, index: int) -> Tuple[Optional[Process], int, int]:
+        if index < self.__prefix_length:
+            k = bisect.bisect_right(self.__segment_firsts, index) - 1
+            process, start, end = self.__segments[k].__process_row(index - self.__segment_firsts[k])
+            if self.__prefix_procs is not None:
+                process = self.__prefix_procs.get(process, process)
+            return process, start, end
+        proc_index, start, end = self.__row(*self.__locate(index - self.__prefix_length))
+        return self.__procs[proc_index] if proc_index != _IDLE else None, start, end
+
+    def __append(self, proc_index: int, start: int, end: int) -> None:
+        # the row before can no longer change once another follows it
+        if self.__starts:
+            busy = self.__ends[-1] - self.__starts[-1] if self.__proc_indices[-1] != _IDLE else 0
+            self.__busy_before.append(self.__busy_before[-1] + busy)
+        else:
+            self.__busy_before.append(0)
+        self.__starts.append(start)
+        self.__ends.append(end)
+        self.__proc_indices.append(proc_index)
+
+    def __peel_last_cycle(self) -> None:
+        # turns the last repetition of a trailing cycle back into plain slices
+        cycle = self.__cycles[-1]
+        cycle_time = len(cycle.pattern) * cycle.slice_length
+        start = self.__ends[-1] - cycle_time
+        cycle.repeats -= 1
+        self.__slice_index = None
+        if cycle.repeats == 0:
+            self.__starts.pop()
+            self.__ends.pop()
+            self.__proc_indices.pop()
+            self.__busy_before.pop()
+            self.__cycles.pop()
+            self.__cycle_physical.pop()
+            self.__cycle_logical.pop()
+        else:
+            self.__ends[-1] = start
+        for proc_index in cycle.pattern:
+            self.__append(proc_index, start, start + cycle.slice_length)
+            start += cycle.slice_length
+
     def add_task(self, process: Optional[Process], start: int, end: int) -> None:
-        if (self.__tasks and self.__tasks[-1].end != start):
+        if (self.__ends and self.__ends[-1] != start):
             raise ValueError("Invalid start time")
         elif (start >= end):
             raise ValueError("Invalid end time")
-        self.__tasks.append(ProcessTask(process, start, end))
+        proc_index = self.__proc_index(process)
+        if self.__proc_indices and self.__proc_indices[-1] == _CYCLE and self.__cycles[-1].pattern[-1] == proc_index:
+            self.__peel_last_cycle()
+        if self.__proc_indices and self.__proc_indices[-1] == proc_index:
+            self.__ends[-1] = end
+            return
+        self.__append(proc_index, start, end)
+        self.__length += 1
+
+    def add_tasks(self, processes: SequenceType[Optional[Process]], starts: SequenceType[int], ends: SequenceType[int]) -> None:
+        # add_task for a run of contiguous slices at once, such as a whole schedule from
+        # the vectorized engine; runs where neighbours coalesce take the add_task path
+        if len(starts) != len(processes) or len(ends) != len(processes):
+            raise ValueError("Invalid tasks")
+        if not processes:
+            return
+        starts = starts if isinstance(starts, array) else array('q', starts)
+        ends = ends if isinstance(ends, array) else array('q', ends)
+        if (self.__ends and self.__ends[-1] != starts[0]) or starts[1:] != ends[:-1]:
+            raise ValueError("Invalid start time")
+        elif any(map(operator.ge, starts, ends)):
+            raise ValueError("Invalid end time")
+        # interned in bulk: the new processes in first-seen order, then one lookup per slice
+        lookup = self.__proc_lookup
+        new_procs = [process for process in dict.fromkeys(processes) if process is not None and process not in lookup]
+        lookup.update(zip(new_procs, range(len(self.__procs), len(self.__procs) + len(new_procs))))
+        self.__procs.extend(new_procs)
+        proc_indices = array('q', map(lookup.get, processes, repeat(_IDLE)))
+        last = self.__proc_indices[-1] if self.__proc_indices else None
+        if last == proc_indices[0] or (last == _CYCLE and self.__cycles[-1].pattern[-1] == proc_indices[0]) or any(
+            map(operator.eq, proc_indices[1:], proc_indices[:-1])
+        ):
+            for process, start, end in zip(processes, starts, ends):
+                self.add_task(process, start, end)
+            return
+        busy_before = 0
+        if self.__starts:
+            busy_before = self.__busy_before[-1] + (self.__ends[-1] - self.__starts[-1] if last != _IDLE else 0)
+        busy = map(operator.mul, map(operator.sub, ends, starts), map(operator.ne, proc_indices, repeat(_IDLE)))
+        self.__busy_before.extend(accumulate(islice(busy, len(proc_indices) - 1), initial=busy_before))
+        self.__starts.extend(starts)
+        self.__ends.extend(ends)
+        self.__proc_indices.extend(proc_indices)
+        self.__length += len(proc_indices)
+
+    def add_cycle(self, processes: SequenceType[Process], start: int, slice_length: int, repeats: int) -> None:
+        if (self.__ends and self.__ends[-1] != start):
+            raise ValueError("Invalid start time")
+        elif slice_length <= 0 or repeats <= 0 or not processes:
+            raise ValueError("Invalid cycle")
+        elif any(process is None for process in processes) or (len(processes) > 1 and any(
+            processes[i] is processes[i - 1] for i in range(len(processes))
+        )):
+            raise ValueError("Invalid cycle")
+        if len(processes) == 1:
+            self.add_task(processes[0], start, start + slice_length * repeats)
+            return
+        pattern = tuple(self.__proc_index(process) for process in processes)
+        last = self.__proc_indices[-1] if self.__proc_indices else None
+        if last == pattern[0] or (last == _CYCLE and self.__cycles[-1].pattern[-1] == pattern[0]):
+            # the first repetition has to coalesce with the slice before it
+            for process in processes:
+                self.add_task(process, start, start + slice_length)
+                start += slice_length
+            repeats -= 1
+            if not repeats:
+                return
+        self.__append(_CYCLE, start, start + len(pattern) * slice_length * repeats)
+        self.__cycles.append(_Cycle(pattern, slice_length, repeats))
+        self.__cycle_physical.append(len(self.__starts) - 1)
+        self.__cycle_logical.append(self.__length)
+        self.__length += len(pattern) * repeats
 
     def clear(self) -> None:
-        self.__tasks.clear()
+        # fresh containers, never cleared in place, since a frozen prefix may still own the old ones
+        self.__starts = array('q')
+        self.__ends = array('q')
+        self.__proc_indices = array('q')
+        self.__procs = []
+        self.__proc_lookup = {}
+        self.__cycles = []
+        self.__cycle_physical = array('q')
+        self.__cycle_logical = array('q')
+        self.__length = 0
+        self.__busy_before = array('q')
+        self.__slice_index = None
+        self.__indexed_rows = 0
+        self.__segments = ()
+        self.__segment_firsts = array('q')
+        self.__segment_starts = array('q')
+        self.__segment_busy = array('q')
+        self.__prefix_length = 0
+        self.__prefix_procs = None
+        self.__mapped_segments = 0
+        self.__prefix_busy = 0
+        self.__prefix_inverse = None
+
+    def __copy_last_row(self, source: "ProcessTimeline", processes: Optional[Dict[Process, Process]]) -> None:
+        if not source.__starts:
+            return
+        mapping = processes or {}
+        proc_index = source.__proc_indices[-1]
+        if proc_index == _CYCLE:
+            cycle = source.__cycles[-1]
+            self.add_cycle(
+                [mapping.get(source.__procs[i], source.__procs[i]) for i in cycle.pattern],
+                source.__starts[-1], cycle.slice_length, cycle.repeats,
+            )
+        else:
+            process = source.__procs[proc_index] if proc_index != _IDLE else None
+            self.add_task(mapping.get(process, process), source.__starts[-1], source.__ends[-1])
+
+    def __freeze(self) -> None:
+        # Moves the stored rows into a frozen segment appended to the prefix; the last
+        # row is copied back out, since coalescing may still extend it. The segment
+        # tuple and arrays are replaced rather than extended, as forks share them.
+        frozen = ProcessTimeline()
+        frozen.__dict__.update(self.__dict__)
+        frozen.__segments = ()
+        frozen.__segment_firsts = frozen.__segment_starts = frozen.__segment_busy = array('q')
+        frozen.__prefix_length = frozen.__prefix_busy = frozen.__mapped_segments = 0
+        frozen.__prefix_procs = frozen.__prefix_inverse = None
+        mapping = self.__prefix_procs
+        if mapping is not None and any(mapping.get(process, process) is not process for process in frozen.__procs):
+            # a process the mapping translates also ran here as itself, so it is
+            # stored under a stand-in key that the mapping translates back
+            mapping = dict(mapping)
+            for proc_index, process in enumerate(frozen.__procs):
+                if mapping.get(process, process) is not process:
+                    stand_in = frozen.__procs[proc_index] = _StandIn()
+                    mapping[stand_in] = process
+                    del frozen.__proc_lookup[process]
+                    frozen.__proc_lookup[stand_in] = proc_index
+        last_span = frozen.__cycles[-1].span if frozen.__proc_indices[-1] == _CYCLE else 1
+        segments = self.__segments + (frozen,)
+        firsts = self.__segment_firsts + array('q', (self.__prefix_length,))
+        starts = self.__segment_starts + array('q', (frozen.__starts[0],))
+        busy = self.__segment_busy + array('q', (self.__prefix_busy,))
+        prefix_length = self.__prefix_length + frozen.__length - last_span
+        prefix_busy = self.__prefix_busy
+        mapped_segments = self.__mapped_segments
+        self.clear()
+        self.__segments = segments
+        self.__segment_firsts = firsts
+        self.__segment_starts = starts
+        self.__segment_busy = busy
+        self.__prefix_length = prefix_length
+        self.__prefix_procs = mapping
+        self.__mapped_segments = mapped_segments
+        self.__copy_last_row(frozen, mapping)
+        self.__prefix_busy = prefix_busy + frozen.__busy_until(self.__starts[0])
+
+    def __iter_entries(self) -> Iterator[Tuple[Tuple[Optional[Process], ...], int, int, int]]:
+        # physical entries as (pattern, start, slice_length, repeats); a plain task has one repeat
+        mapping = self.__prefix_procs or {}
+        for segment in self.__segments:
+            for pattern, start, slice_length, repeats in segment.__iter_local_entries(drop_last=True):
+                yield tuple(mapping.get(process, process) for process in pattern), start, slice_length, repeats
+        yield from self.__iter_local_entries()
 
-    def __getitem__(self, index: int) -> ProcessTask:
-        return self.__tasks[index]
+    def __iter_local_entries(self, drop_last: bool = False) -> Iterator[Tuple[Tuple[Optional[Process], ...], int, int, int]]:
+        next_cycle = 0
+        for physical in range(len(self.__starts) - (1 if drop_last else 0)):
+            proc_index = self.__proc_indices[physical]
+            start = self.__starts[physical]
+            if proc_index == _CYCLE:
+                cycle = self.__cycles[next_cycle]
+                next_cycle += 1
+                yield tuple(self.__procs[i] for i in cycle.pattern), start, cycle.slice_length, cycle.repeats
+            else:
+                process = self.__procs[proc_index] if proc_index != _IDLE else None
+                yield (process,), start, self.__ends[physical] - start, 1
+
+    def encode(self, processes: SequenceType[Process]) -> bytes:
+        # Compact form for caching: a zlib-compressed int64 stream that refers to
+        # processes by their position in processes. Starts are implicit, since each
+        # entry begins where the previous one ends, and cycles stay compressed.
+        index = {process: i for i, process in enumerate(processes)}
+        index[None] = _IDLE
+        data = array('q')
+        for pattern, start, slice_length, repeats in self.__iter_entries():
+            if not data:
+                data.append(start)
+            if len(pattern) == 1:
+                data.extend((index[pattern[0]], slice_length))
+            else:
+                data.extend((_CYCLE, slice_length, repeats, len(pattern)))
+                data.extend(index[process] for process in pattern)
+        return zlib.compress(data.tobytes())
+
+    @classmethod
+    def decode(cls, encoded: bytes, processes: SequenceType[Process]) -> "ProcessTimeline":
+        data = array('q')
+        data.frombytes(zlib.decompress(encoded))
+        timeline = cls()
+        i = 1
+        time = data[0] if data else 0
+        while i < len(data):
+            if data[i] == _CYCLE:
+                slice_length, repeats, count = data[i + 1], data[i + 2], data[i + 3]
+                pattern = [processes[j] for j in data[i + 4:i + 4 + count]]
+                timeline.add_cycle(pattern, time, slice_length, repeats)
+                time += slice_length * repeats * count
+                i += 4 + count
+            else:
+                end = time + data[i + 1]
+                timeline.add_task(processes[data[i]] if data[i] != _IDLE else None, time, end)
+                time = end
+                i += 2
+        return timeline
+
+    def fork(self, processes: Optional[Dict[Process, Process]] = None) -> "ProcessTimeline":
+        # Copy-on-write: every row but the last is shared with the returned timeline,
+        # and both may keep appending independently. processes maps this timeline's
+        # processes to the ones the fork should report, as when forking a scheduler.
+        if len(self.__starts) > 1:
+            self.__freeze()
+        fork = ProcessTimeline()
+        fork.__segments = self.__segments
+        fork.__segment_firsts = self.__segment_firsts
+        fork.__segment_starts = self.__segment_starts
+        fork.__segment_busy = self.__segment_busy
+        fork.__prefix_length = self.__prefix_length
+        fork.__prefix_busy = self.__prefix_busy
+        fork.__prefix_procs = self.__prefix_procs
+        fork.__mapped_segments = self.__mapped_segments
+        if processes:
+            # processes applies on top of what the prefix already translates; the
+            # segments frozen since the last translation add their processes as keys
+            mapping = self.__prefix_procs or {}
+            fork.__prefix_procs = {process: processes.get(mapped, mapped) for process, mapped in mapping.items()}
+            for segment in self.__segments[self.__mapped_segments:]:
+                fork.__prefix_procs.update(
+                    (process, processes.get(process, process)) for process in segment.__procs if process not in mapping
+                )
+            fork.__mapped_segments = len(self.__segments)
+        fork.__copy_last_row(self, processes)
+        return fork
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ProcessTask, List[ProcessTask]]:
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(len(self))
+            if step == 1:
+                return [ProcessTask(*row) for row in self.__iter_process_rows(lo, hi)]
+            return [self[i] for i in range(lo, hi, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("timeline index out of range")
+        return ProcessTask(*self.__process_row(index))
 
     def __len__(self) -> int:
-        return len(self.__tasks)
+        return self.__prefix_length + self.__length
 
-    def __iter__(self):
-        return iter(self.__tasks)
-    
-    def __str__(self) -> str:
-        out = ""
-        width = shutil.get_terminal_size().columns
-        max_name_length = min(4, max(len(task.process.name if task.process else '──') for task in self.__tasks) + 2)
+    def __iter__(self) -> Iterator[ProcessTask]:
+        for row in self.__iter_process_rows(0, len(self)):
+            yield ProcessTask(*row)
+
+    def __first_ending_after(self, time: int) -> int:
+        if self.__segments and time < self.__starts[0]:
+            k = self.__segment_at(time)
+            if k < 0:
+                return 0
+            first, last = self.__segment_bounds(k)
+            return min(first + self.__segments[k].__local_first_ending_after(time), last)
+        return self.__prefix_length + self.__local_first_ending_after(time)
+
+    def __first_starting_at(self, time: int) -> int:
+        if self.__segments and time <= self.__starts[0]:
+            k = bisect.bisect_left(self.__segment_starts, time) - 1
+            if k < 0:
+                return 0
+            first, last = self.__segment_bounds(k)
+            return min(first + self.__segments[k].__local_first_starting_at(time), last)
+        return self.__prefix_length + self.__local_first_starting_at(time)
+
+    def __local_first_ending_after(self, time: int) -> int:
+        physical = bisect.bisect_right(self.__ends, time)
+        if physical < len(self.__ends) and self.__proc_indices[physical] == _CYCLE:
+            first, cycle = self.__cycle_of(physical)
+            return first + max(0, (time - self.__starts[physical]) // cycle.slice_length)
+        return self.__logical(physical)
+
+    def __local_first_starting_at(self, time: int) -> int:
+        physical = bisect.bisect_left(self.__starts, time)
+        if physical > 0 and self.__proc_indices[physical - 1] == _CYCLE:
+            first, cycle = self.__cycle_of(physical - 1)
+            offset = -((self.__starts[physical - 1] - time) // cycle.slice_length)
+            if offset < cycle.span:
+                return first + offset
+        return self.__logical(physical)
+
+    def __window(self, start: Optional[int], end: Optional[int]) -> range:
+        lo = 0 if start is None else self.__first_ending_after(start)
+        hi = len(self) if end is None else self.__first_starting_at(end)
+        return range(lo, max(lo, hi))
+
+    def task_at(self, time: int) -> Optional[ProcessTask]:
+        # the slice running at time (start <= time < end), or None outside the timeline
+        index = self.__first_ending_after(time)
+        if index >= len(self):
+            return None
+        process, start, end = self.__process_row(index)
+        return ProcessTask(process, start, end) if start <= time else None
+
+    def tasks_between(self, start: int, end: int) -> List[ProcessTask]:
+        # every slice overlapping [start, end)
+        window = self.__window(start, end)
+        return [ProcessTask(*row) for row in self.__iter_process_rows(window.start, window.stop)]
+
+    def __busy_until(self, time: int) -> int:
+        if self.__segments and time <= self.__starts[0]:
+            k = self.__segment_at(time)
+            return self.__segment_busy[k] + self.__segments[k].__busy_until(time) if k >= 0 else 0
+        physical = bisect.bisect_right(self.__starts, time) - 1
+        if physical < 0:
+            return self.__prefix_busy
+        busy = self.__prefix_busy + self.__busy_before[physical]
+        if self.__proc_indices[physical] != _IDLE:
+            busy += min(time, self.__ends[physical]) - self.__starts[physical]
+        return busy
+
+    def busy_time(self, start: Optional[int] = None, end: Optional[int] = None) -> int:
+        # time spent running processes within [start, end), from prefix sums over the rows
+        if not len(self):
+            return 0
+        lo = self.__busy_until(start) if start is not None else 0
+        hi = self.__busy_until(end) if end is not None else self.__busy_until(self.__ends[-1])
+        return max(hi - lo, 0)
+
+    def utilization(self, start: int, end: int) -> float:
+        if end <= start:
+            raise ValueError("Invalid window")
+        return self.busy_time(start, end) / (end - start)
+
+    def __index_slices(self) -> Dict[int, array]:
+        if self.__slice_index is None:
+            self.__slice_index = {}
+            self.__indexed_rows = 0
+        index = self.__slice_index
+        next_cycle = bisect.bisect_left(self.__cycle_physical, self.__indexed_rows)
+        for physical in range(self.__indexed_rows, len(self.__starts)):
+            proc_index = self.__proc_indices[physical]
+            if proc_index == _CYCLE:
+                slice_owners = set(self.__cycles[next_cycle].pattern)
+                next_cycle += 1
+            else:
+                slice_owners = (proc_index,)
+            for owner in slice_owners:
+                rows = index.get(owner)
+                if rows is None:
+                    rows = index[owner] = array('q')
+                rows.append(physical)
+        self.__indexed_rows = len(self.__starts)
+        return index
+
+    def __iter_rows_of(self, process: Optional[Process]) -> Iterator[Tuple[int, int]]:
+        if self.__segments:
+            mapping = self.__prefix_procs or {}
+            if self.__prefix_inverse is None:
+                self.__prefix_inverse = {}
+                for original, mapped in mapping.items():
+                    self.__prefix_inverse.setdefault(mapped, []).append(original)
+            originals = list(self.__prefix_inverse.get(process, ()))
+            if process not in mapping:
+                originals.append(process)
+            for k, segment in enumerate(self.__segments):
+                # a segment's last row is the next one's first, so it is cut off there
+                cut = self.__segment_starts[k + 1] if k + 1 < len(self.__segments) else self.__starts[0]
+                runs = [segment.__iter_rows_of(original) for original in originals]
+                for start, end in runs[0] if len(runs) == 1 else heapq.merge(*runs):
+                    if start >= cut:
+                        break
+                    yield start, end
+        proc_index = _IDLE if process is None else self.__proc_lookup.get(process)
+        if proc_index is None:
+            return
+        for physical in self.__index_slices().get(proc_index, ()):
+            start = self.__starts[physical]
+            if self.__proc_indices[physical] != _CYCLE:
+                yield start, self.__ends[physical]
+                continue
+            cycle = self.__cycle_of(physical)[1]
+            positions = [k for k, i in enumerate(cycle.pattern) if i == proc_index]
+            cycle_time = len(cycle.pattern) * cycle.slice_length
+            for repeat in range(cycle.repeats):
+                for k in positions:
+                    slice_start = start + repeat * cycle_time + k * cycle.slice_length
+                    yield slice_start, slice_start + cycle.slice_length
+
+    def tasks_of(self, process: Optional[Process]) -> Iterator[ProcessTask]:
+        # the slices of one process (None for idle gaps) in time order, from a per-process row index
+        for start, end in self.__iter_rows_of(process):
+            yield ProcessTask(process, start, end)
+
+    @staticmethod
+    def __name(process: Optional[Process]) -> str:
+        return process.name if process is not None else '──'
+
+    def __window_names(self, window: range) -> set:
+        names = set()
+        if window.start < self.__prefix_length:
+            mapping = self.__prefix_procs or {}
+            for k in range(bisect.bisect_right(self.__segment_firsts, window.start) - 1, len(self.__segments)):
+                first, last = self.__segment_bounds(k)
+                if first >= window.stop:
+                    break
+                procs = self.__segments[k].__local_window_procs(max(window.start, first) - first, min(window.stop, last) - first)
+                names.update(self.__name(mapping.get(process, process)) for process in procs)
+        if window.stop > self.__prefix_length:
+            names.update(map(self.__name, self.__local_window_procs(
+                max(window.start - self.__prefix_length, 0), window.stop - self.__prefix_length,
+            )))
+        return names
+
+    def __local_window_procs(self, lo: int, hi: int) -> set:
+        # the processes of the own logical rows [lo, hi), None for idle
+        lo = self.__locate(lo)[0]
+        hi = self.__locate(hi - 1)[0] + 1
+        proc_indices = set(self.__proc_indices[lo:hi])
+        if _CYCLE in proc_indices:
+            proc_indices.discard(_CYCLE)
+            for j in range(bisect.bisect_left(self.__cycle_physical, lo), bisect.bisect_left(self.__cycle_physical, hi)):
+                proc_indices.update(self.__cycles[j].pattern)
+        return {self.__procs[i] if i != _IDLE else None for i in proc_indices}
+
+    def iter_render(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        head: Optional[int] = None,
+        tail: Optional[int] = None,
+        width: Optional[int] = None,
+    ) -> Iterator[str]:
+        window = self.__window(start, end)
+        if not window:
+            return
+        segments = [window]
+        if (head is not None or tail is not None) and (head or 0) + (tail or 0) < len(window):
+            segments = [
+                segment for segment in (window[:head or 0], window[len(window) - (tail or 0):])
+                if segment
+            ]
+        if not segments:
+            return
+        width = width or shutil.get_terminal_size().columns
+        # one pre-pass over the distinct processes of the window for column widths
+        names = set()
+        for segment in segments:
+            names.update(self.__window_names(segment))
+        max_name_length = min(4, max(len(name) for name in names) + 2)
         max_cell_length = max_name_length + 1
         cells_per_row = (width // max_cell_length) - 1
-        begin_spaces = " " * ((width - ((max_cell_length * cells_per_row) + len(str(self.__tasks[-1].end)))) // 2)
-        for i in range(0, len(self.__tasks), cells_per_row):
-            tasks = self.__tasks[i:i + cells_per_row]
-            border_top = begin_spaces + "╭" + "─" * max_name_length + ("┬" + "─" * max_name_length) * (len(tasks) - 1) + "╮"
-            border_bot = begin_spaces + "╰" + "─" * max_name_length + ("┴" + "─" * max_name_length) * (len(tasks) - 1) + "╯"
-            out += border_top + "\n" + begin_spaces
-            for task in tasks:
-                out += f"│{(task.process.name if task.process else '──').center(max_name_length)}"
-            out += f"│\n{border_bot}\n{begin_spaces}"
-            for task in tasks:
-                out += str(task.start).ljust(max_name_length + 1)
-            out += f"{str(task.end).ljust(max_name_length)}\n"
-        return out
+        last_end = self.__process_row(segments[-1][-1])[2]
+        begin_spaces = " " * ((width - ((max_cell_length * cells_per_row) + len(str(last_end)))) // 2)
+        for segment_index, segment in enumerate(segments):
+            if segment_index:
+                yield f"{begin_spaces}⋮\n"
+            rows = self.__iter_process_rows(segment.start, segment.stop)
+            while row := list(islice(rows, cells_per_row)):
+                yield begin_spaces + "╭" + "─" * max_name_length + ("┬" + "─" * max_name_length) * (len(row) - 1) + "╮\n"
+                yield begin_spaces + "".join(f"│{self.__name(process).center(max_name_length)}" for process, _, _ in row) + "│\n"
+                yield begin_spaces + "╰" + "─" * max_name_length + ("┴" + "─" * max_name_length) * (len(row) - 1) + "╯\n"
+                yield begin_spaces + "".join(str(row_start).ljust(max_name_length + 1) for _, row_start, _ in row) + f"{str(row[-1][2]).ljust(max_name_length)}\n"
+
+    def render(self, stream: TextIO, **kwargs) -> None:
+        stream.writelines(self.iter_render(**kwargs))
+
+    def __str__(self) -> str:
+        return "".join(self.iter_render())
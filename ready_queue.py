@@ -0,0 +1,247 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+import heapq
+
+from process import Process
+from sched_stats import SchedStats
+
+
+class ReadyQueue(ABC):
+    EMPTY_QUEUE_ERROR = IndexError("ready queue is empty")
+    NOT_QUEUED_ERROR = ValueError("process is not in the ready queue")
+
+    def __init__(self, key: Optional[Callable[[Process], Any]] = None) -> None:
+        self._key = key
+        self._seq: int = 0
+        self._front_seq: int = 0
+        # remove() is lazy: entries are dropped by sequence number when they surface
+        self._live: Dict[Process, int] = {}
+        self._dead: Set[int] = set()
+
+    def _next_seq(self) -> int:
+        # ties on key are broken FIFO by insertion order, like bisect.insort
+        seq = self._seq
+        self._seq += 1
+        return seq
+
+    def _next_front_seq(self) -> int:
+        self._front_seq -= 1
+        return self._front_seq
+
+    def _is_dead(self, seq: int) -> bool:
+        if seq in self._dead:
+            self._dead.discard(seq)
+            return True
+        return False
+
+    @abstractmethod
+    def push(self, process: Process) -> None:
+        pass
+
+    @abstractmethod
+    def push_front(self, process: Process) -> None:
+        pass
+
+    @abstractmethod
+    def pop(self) -> Process:
+        pass
+
+    @abstractmethod
+    def peek(self) -> Process:
+        pass
+
+    def remove(self, process: Process) -> None:
+        seq = self._live.pop(process, None)
+        if seq is None:
+            raise ReadyQueue.NOT_QUEUED_ERROR
+        self._dead.add(seq)
+
+    def clear(self) -> None:
+        self._seq = 0
+        self._front_seq = 0
+        self._live.clear()
+        self._dead.clear()
+
+    def __contains__(self, process: Process) -> bool:
+        return process in self._live
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __bool__(self) -> bool:
+        return len(self._live) > 0
+
+    def instrument(self, stats: SchedStats) -> None:
+        # shadows push/pop on this instance only, so uninstrumented queues pay nothing
+        push, push_front, pop = self.push, self.push_front, self.pop
+
+        def counted_push(process: Process) -> None:
+            stats.queue_pushes += 1
+            push(process)
+
+        def counted_push_front(process: Process) -> None:
+            stats.queue_pushes += 1
+            push_front(process)
+
+        def counted_pop() -> Process:
+            stats.queue_pops += 1
+            return pop()
+
+        self.push = counted_push
+        self.push_front = counted_push_front
+        self.pop = counted_pop
+
+    def uninstrument(self) -> None:
+        self.__dict__.pop("push", None)
+        self.__dict__.pop("push_front", None)
+        self.__dict__.pop("pop", None)
+
+
+class FifoReadyQueue(ReadyQueue):
+    def __init__(self, key: Optional[Callable[[Process], Any]] = None) -> None:
+        super().__init__(key)
+        self.__queue: Deque[Tuple[int, Process]] = deque()
+
+    def push(self, process: Process) -> None:
+        seq = self._next_seq()
+        self._live[process] = seq
+        self.__queue.append((seq, process))
+
+    def push_front(self, process: Process) -> None:
+        seq = self._next_front_seq()
+        self._live[process] = seq
+        self.__queue.appendleft((seq, process))
+
+    def __discard_dead(self) -> None:
+        while self.__queue and self._is_dead(self.__queue[0][0]):
+            self.__queue.popleft()
+
+    def pop(self) -> Process:
+        self.__discard_dead()
+        if not self.__queue:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        process = self.__queue.popleft()[1]
+        del self._live[process]
+        return process
+
+    def peek(self) -> Process:
+        self.__discard_dead()
+        if not self.__queue:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        return self.__queue[0][1]
+
+    def clear(self) -> None:
+        super().clear()
+        self.__queue.clear()
+
+
+class HeapReadyQueue(ReadyQueue):
+    def __init__(self, key: Callable[[Process], Any]) -> None:
+        super().__init__(key)
+        self.__heap: List[tuple] = []
+
+    def __push(self, process: Process, seq: int) -> None:
+        self._live[process] = seq
+        heapq.heappush(self.__heap, (self._key(process), seq, process))
+
+    def push(self, process: Process) -> None:
+        self.__push(process, self._next_seq())
+
+    def push_front(self, process: Process) -> None:
+        # wins ties against everything already queued under the same key
+        self.__push(process, self._next_front_seq())
+
+    def __discard_dead(self) -> None:
+        while self.__heap and self._is_dead(self.__heap[0][1]):
+            heapq.heappop(self.__heap)
+
+    def pop(self) -> Process:
+        self.__discard_dead()
+        if not self.__heap:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        process = heapq.heappop(self.__heap)[2]
+        del self._live[process]
+        return process
+
+    def peek(self) -> Process:
+        self.__discard_dead()
+        if not self.__heap:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        return self.__heap[0][2]
+
+    def clear(self) -> None:
+        super().clear()
+        self.__heap.clear()
+
+
+class _PairingNode:
+    __slots__ = ("rank", "process", "children")
+
+    def __init__(self, rank: tuple, process: Process) -> None:
+        self.rank = rank
+        self.process = process
+        self.children: List["_PairingNode"] = []
+
+
+class PairingHeapReadyQueue(ReadyQueue):
+    def __init__(self, key: Callable[[Process], Any]) -> None:
+        super().__init__(key)
+        self.__root: Optional[_PairingNode] = None
+
+    @staticmethod
+    def __meld(a: Optional[_PairingNode], b: Optional[_PairingNode]) -> Optional[_PairingNode]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.rank < a.rank:
+            a, b = b, a
+        a.children.append(b)
+        return a
+
+    def __push(self, process: Process, seq: int) -> None:
+        self._live[process] = seq
+        node = _PairingNode((self._key(process), seq), process)
+        self.__root = PairingHeapReadyQueue.__meld(self.__root, node)
+
+    def push(self, process: Process) -> None:
+        self.__push(process, self._next_seq())
+
+    def push_front(self, process: Process) -> None:
+        self.__push(process, self._next_front_seq())
+
+    def __pop_root(self) -> _PairingNode:
+        root = self.__root
+        children = root.children
+        paired = [
+            PairingHeapReadyQueue.__meld(children[i], children[i + 1] if i + 1 < len(children) else None)
+            for i in range(0, len(children), 2)
+        ]
+        new_root = None
+        for node in reversed(paired):
+            new_root = PairingHeapReadyQueue.__meld(node, new_root)
+        self.__root = new_root
+        return root
+
+    def __discard_dead(self) -> None:
+        while self.__root is not None and self._is_dead(self.__root.rank[1]):
+            self.__pop_root()
+
+    def pop(self) -> Process:
+        self.__discard_dead()
+        if self.__root is None:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        process = self.__pop_root().process
+        del self._live[process]
+        return process
+
+    def peek(self) -> Process:
+        self.__discard_dead()
+        if self.__root is None:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        return self.__root.process
+
+    def clear(self) -> None:
+        super().clear()
+        self.__root = None
@@ -0,0 +1,188 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+import hashlib
+import json
+import os
+
+from cpu_sched_base import CPUSchedBase
+from process_timeline import ProcessTimeline
+
+# bump whenever a scheduler change can alter results, so stale entries stop matching
+CACHE_VERSION = 2
+
+
+@dataclass
+class CachedResult:
+    # per-process starts and ends follow processes_list; timeline is ProcessTimeline.encode output
+    CORRUPT_ENTRY_ERROR = ValueError("cache entry is truncated or corrupt")
+
+    starts: array
+    ends: array
+    end_time: int
+    timeline: Optional[bytes] = None
+
+    # On disk an entry is plain data, never code: an int64 header of end time,
+    # process count and timeline length (-1 for none), the starts and ends, then
+    # the timeline bytes.
+    def to_bytes(self) -> bytes:
+        header = array('q', (self.end_time, len(self.starts), -1 if self.timeline is None else len(self.timeline)))
+        return header.tobytes() + self.starts.tobytes() + self.ends.tobytes() + (self.timeline or b"")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedResult":
+        if len(data) < 24:
+            raise CachedResult.CORRUPT_ENTRY_ERROR
+        header = array('q')
+        header.frombytes(data[:24])
+        if header[1] < 0:
+            raise CachedResult.CORRUPT_ENTRY_ERROR
+        end_time, count, timeline_length = header
+        columns_end = 24 + 16 * count
+        if len(data) != columns_end + max(timeline_length, 0):
+            raise CachedResult.CORRUPT_ENTRY_ERROR
+        starts = array('q')
+        starts.frombytes(data[24:24 + 8 * count])
+        ends = array('q')
+        ends.frombytes(data[24 + 8 * count:columns_end])
+        return cls(starts, ends, end_time, data[columns_end:] if timeline_length >= 0 else None)
+
+
+def result_key(sched: CPUSchedBase) -> str:
+    # content hash of the process columns, the scheduler class and its parameters
+    digest = hashlib.blake2b(digest_size=20)
+    header = [CACHE_VERSION, type(sched).__module__, type(sched).__qualname__, sched.params]
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    for column in ("arrival", "burst", "priority"):
+        digest.update(array('q', (getattr(process, column) for process in sched.processes_list)).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    # An in-memory LRU of recent results in front of an optional on-disk tier.
+    # Disk entries are one file per key; the least recently used files are
+    # evicted once the directory grows past max_disk_bytes. The directory is
+    # scanned once when the cache is opened, and its entries and size are then
+    # tracked in memory.
+    INVALID_LIMIT_ERROR = ValueError("cache limits must be positive")
+
+    def __init__(self, directory: Optional[str] = None, memory_entries: int = 128, max_disk_bytes: int = 256 * 2**20) -> None:
+        if memory_entries <= 0 or max_disk_bytes <= 0:
+            raise ResultCache.INVALID_LIMIT_ERROR
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__memory: "OrderedDict[str, CachedResult]" = OrderedDict()
+        # disk entry key -> file size, least recently used first
+        self.__disk: "OrderedDict[str, int]" = OrderedDict()
+        self.__disk_bytes: int = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.__scan()
+
+    def __scan(self) -> None:
+        # the mtime doubles as the disk tier's recency across runs
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".result"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(".result")], stat.st_size))
+        entries.sort()
+        self.__disk = OrderedDict((key, size) for _, key, size in entries)
+        self.__disk_bytes = sum(self.__disk.values())
+        self.__evict()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.result")
+
+    def __remember(self, key: str, result: CachedResult) -> None:
+        self.__memory[key] = result
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.memory_entries:
+            self.__memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        result = self.__memory.get(key)
+        if result is not None:
+            self.__memory.move_to_end(key)
+            if key in self.__disk:
+                self.__disk.move_to_end(key)
+            return result
+        if self.directory is None:
+            return None
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            result = CachedResult.from_bytes(data)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        # another process may have written the file since the scan
+        self.__track(key, len(data))
+        self.__remember(key, result)
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        self.__remember(key, result)
+        if self.directory is None:
+            return
+        path = self.__path(key)
+        partial = f"{path}.{os.getpid()}.tmp"
+        data = result.to_bytes()
+        with open(partial, "wb") as file:
+            file.write(data)
+        os.replace(partial, path)
+        self.__track(key, len(data))
+        self.__evict()
+
+    def __track(self, key: str, size: int) -> None:
+        self.__disk_bytes += size - self.__disk.get(key, 0)
+        self.__disk[key] = size
+        self.__disk.move_to_end(key)
+
+    def __evict(self) -> None:
+        while self.__disk_bytes > self.max_disk_bytes and self.__disk:
+            key, size = self.__disk.popitem(last=False)
+            self.__disk_bytes -= size
+            try:
+                os.remove(self.__path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        self.__memory.clear()
+        self.__disk.clear()
+        self.__disk_bytes = 0
+        if self.directory is None:
+            return
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".result"):
+                    os.remove(entry.path)
+
+    def execute(self, sched: CPUSchedBase, record_timeline: bool = True) -> bool:
+        # Stands in for sched.execute(): a hit loads the stored outcome into sched
+        # instead of running it. Returns whether it was a hit.
+        key = result_key(sched)
+        result = self.get(key)
+        if result is not None and (result.timeline is not None or not record_timeline):
+            self.hits += 1
+            processes = sched.processes_list
+            timeline = ProcessTimeline.decode(result.timeline, processes) if record_timeline else None
+            sched.load_result(result.starts, result.ends, result.end_time, timeline)
+            return True
+        self.misses += 1
+        sched.execute(record_timeline)
+        processes = sched.processes_list
+        self.put(key, CachedResult(
+            array('q', (process.start for process in processes)),
+            array('q', (process.end for process in processes)),
+            sched.current_time,
+            sched.proc_timeline.encode(processes) if record_timeline else None,
+        ))
+        return False
@@ -0,0 +1,151 @@
+from collections import Counter
+from typing import Dict, Optional, Sequence
+import math
+
+from process import Process
+
+
+class QuantileSketch:
+    # Log-bucketed sketch (DDSketch style): every quantile estimate is within
+    # relative_accuracy of a true value, and memory grows with the log of the range.
+    INVALID_ACCURACY_ERROR = ValueError("relative_accuracy must be between 0 and 1")
+    NEGATIVE_VALUE_ERROR = ValueError("QuantileSketch only accepts non-negative values")
+    EMPTY_SKETCH_ERROR = ValueError("quantile of an empty sketch")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise QuantileSketch.INVALID_ACCURACY_ERROR
+        self.relative_accuracy = relative_accuracy
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__buckets: Dict[int, int] = {}
+        self.__zero_count: int = 0
+        self.count: int = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < 0:
+            raise QuantileSketch.NEGATIVE_VALUE_ERROR
+        self.count += count
+        if value == 0:
+            self.__zero_count += count
+            return
+        index = math.ceil(math.log(value) / self.__log_gamma)
+        self.__buckets[index] = self.__buckets.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise QuantileSketch.INVALID_ACCURACY_ERROR
+        self.count += other.count
+        self.__zero_count += other.__zero_count
+        for index, count in other.__buckets.items():
+            self.__buckets[index] = self.__buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            raise QuantileSketch.EMPTY_SKETCH_ERROR
+        rank = q * (self.count - 1)
+        seen = self.__zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.__buckets):
+            seen += self.__buckets[index]
+            if rank < seen:
+                return 2 * self.__gamma ** index / (self.__gamma + 1)
+        return 2 * self.__gamma ** max(self.__buckets) / (self.__gamma + 1)
+
+
+class RunningStats:
+    # count and total are always kept; min, max and the quantile sketch only with
+    # distribution, since they cost several times more per value
+    DISTRIBUTION_NOT_TRACKED_ERROR = RuntimeError("quantiles need distribution=True")
+
+    def __init__(self, relative_accuracy: float = 0.01, distribution: bool = True) -> None:
+        self.count: int = 0
+        self.total: int = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self.sketch: Optional[QuantileSketch] = QuantileSketch(relative_accuracy) if distribution else None
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        self.total += value
+        if self.sketch is not None:
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            self.sketch.add(value)
+
+    def add_many(self, values: Sequence[int]) -> None:
+        if not values:
+            return
+        self.count += len(values)
+        self.total += sum(values)
+        if self.sketch is not None:
+            low, high = min(values), max(values)
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+            # equal values share one sketch insert
+            for value, count in Counter(values).items():
+                self.sketch.add(value, count)
+
+    def merge(self, other: "RunningStats") -> None:
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        if self.sketch is None:
+            return
+        if other.sketch is None:
+            # part of the values were never tracked, so neither is the merged distribution
+            self.sketch = None
+            self.min = self.max = None
+            return
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    def quantile(self, q: float) -> float:
+        if self.sketch is None:
+            raise RunningStats.DISTRIBUTION_NOT_TRACKED_ERROR
+        # the sketch estimate is clamped so p0 and p100 are exact
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+
+class RunMetrics:
+    def __init__(self, relative_accuracy: float = 0.01, distributions: bool = True) -> None:
+        self.turnaround = RunningStats(relative_accuracy, distributions)
+        self.waiting = RunningStats(relative_accuracy, distributions)
+        self.response = RunningStats(relative_accuracy, distributions)
+        self.busy_time: int = 0
+
+    @property
+    def distributions(self) -> bool:
+        return self.turnaround.sketch is not None
+
+    def add(self, process: Process) -> None:
+        turnaround = process.turnaround_time
+        burst = process.burst
+        self.turnaround.add(turnaround)
+        self.waiting.add(turnaround - burst)
+        self.response.add(process.response_time)
+        self.busy_time += burst
+
+    def add_columns(self, turnaround: Sequence[int], waiting: Sequence[int], response: Sequence[int], busy_time: int) -> None:
+        # the finished processes of a whole schedule at once, one column per metric
+        self.turnaround.add_many(turnaround)
+        self.waiting.add_many(waiting)
+        self.response.add_many(response)
+        self.busy_time += busy_time
+
+    def merge(self, other: "RunMetrics") -> None:
+        self.turnaround.merge(other.turnaround)
+        self.waiting.merge(other.waiting)
+        self.response.merge(other.response)
+        self.busy_time += other.busy_time
+
+    @property
+    def finished(self) -> int:
+        return self.turnaround.count
@@ -0,0 +1,4 @@
+@echo off
+cd ..
+call .venv\Scripts\activate
+python main.py --algo "Multilevel Queue" --arrival "0 3 4 6 10" --burst "8 4 5 3 2" --priority "2 0 1 2 0"
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, TextIO
+import sys
+
+from process import Process
+
+# the profiler modules load on demand, keeping them out of every import of the schedulers
+if TYPE_CHECKING:
+    import cProfile
+
+# trace(event, time, details) with event one of "slice", "idle" or "cycle"
+TraceHook = Callable[[str, int, Dict[str, Any]], None]
+
+
+class SchedStats:
+    def __init__(self, profile: bool = False, trace: Optional[TraceHook] = None) -> None:
+        self.profile = profile
+        self.trace = trace
+        self.profiler: Optional["cProfile.Profile"] = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.updates: int = 0
+        self.dispatches: int = 0
+        self.context_switches: int = 0
+        self.preemptions: int = 0
+        self.idle_gaps: int = 0
+        self.idle_time: int = 0
+        self.queue_pushes: int = 0
+        self.queue_pops: int = 0
+        self.phase_times: Dict[str, float] = defaultdict(float)
+        self.__last_process: Optional[Process] = None
+        self.__last_finished: bool = True
+
+    def __switch_to(self, process: Process) -> None:
+        if self.__last_process is not None and process is not self.__last_process:
+            self.context_switches += 1
+            if not self.__last_finished:
+                self.preemptions += 1
+
+    def record_slice(self, time: int, process: Optional[Process], duration: int, is_finished: bool) -> None:
+        if process is None:
+            self.idle_gaps += 1
+            self.idle_time += duration
+            if self.trace:
+                self.trace("idle", time, {"duration": duration})
+            return
+        self.dispatches += 1
+        self.__switch_to(process)
+        self.__last_process = process
+        self.__last_finished = is_finished
+        if self.trace:
+            self.trace("slice", time, {"process": process, "duration": duration, "finished": is_finished})
+
+    def record_cycle(self, time: int, processes: Sequence[Process], slice_length: int, repeats: int) -> None:
+        # every slice of a cycle switches away from a process that is still unfinished
+        slices = len(processes) * repeats
+        self.dispatches += slices
+        self.__switch_to(processes[0])
+        self.context_switches += slices - 1
+        self.preemptions += slices - 1
+        self.__last_process = processes[-1]
+        self.__last_finished = False
+        if self.trace:
+            self.trace("cycle", time, {"processes": processes, "slice_length": slice_length, "repeats": repeats})
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "updates": self.updates,
+            "dispatches": self.dispatches,
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "idle_gaps": self.idle_gaps,
+            "idle_time": self.idle_time,
+            "queue_pushes": self.queue_pushes,
+            "queue_pops": self.queue_pops,
+            "phase_times": dict(self.phase_times),
+        }
+
+    def print_profile(self, stream: TextIO = sys.stdout, sort: str = "cumulative", limit: int = 20) -> None:
+        if self.profiler is None:
+            return
+        import pstats
+        pstats.Stats(self.profiler, stream=stream).sort_stats(sort).print_stats(limit)
@@ -0,0 +1,184 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence
+import heapq
+
+from cpu_sched_base import CPUSchedBase
+from process import Process, ProcessTable
+from process_timeline import ProcessTimeline
+from run_metrics import RunMetrics
+import workload_io
+
+if TYPE_CHECKING:
+    from process_stats import ProcessStats
+
+PLACEMENTS = ("least_work", "round_robin")
+
+
+class SMPSched:
+    # Runs one single-core scheduler per simulated core, each with its own ready
+    # queues, clock and timeline. Every arrival is placed on a core when it
+    # arrives: "least_work" picks the core with the least outstanding work, ties
+    # going to the core that has been idle longest, and "round_robin" deals them
+    # out in turn. Every policy here is work-conserving, so a core's backlog only
+    # depends on the work placed on it and not on the policy, which lets placement
+    # run ahead of the cores and the cores run one after another.
+    INVALID_CORES_ERROR = ValueError("cores must be positive")
+    UNKNOWN_PLACEMENT_ERROR = ValueError("placement must be least_work or round_robin")
+    NOT_EXECUTED_ERROR = RuntimeError("results are only available after execute()")
+
+    def __init__(
+        self,
+        sched_factory: Callable[[], CPUSchedBase],
+        cores: int,
+        processes: Iterable[Process] = [],
+        placement: str = "least_work",
+    ) -> None:
+        if cores <= 0:
+            raise SMPSched.INVALID_CORES_ERROR
+        if placement not in PLACEMENTS:
+            raise SMPSched.UNKNOWN_PLACEMENT_ERROR
+        self.sched_factory = sched_factory
+        self.cores = cores
+        self.placement = placement
+        self.__procs: List[Process] = []
+        # the ids handed out by load_many, in input order as CPUSchedBase does
+        self.__process_ids: Dict[Process, int] = {}
+        self.__core_scheds: List[CPUSchedBase] = [sched_factory() for _ in range(cores)]
+        self.__core_of: Dict[Process, int] = {}
+        self.__metrics: RunMetrics = RunMetrics()
+        self.__time: int = 0
+        self.__has_executed: bool = False
+        self.load_many(processes)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        sched_factory: Callable[[], CPUSchedBase],
+        cores: int,
+        arrivals: Sequence[int],
+        bursts: Sequence[int],
+        priorities: Optional[Sequence[int]] = None,
+        names: Optional[Sequence[str]] = None,
+        **kwargs
+    ) -> "SMPSched":
+        if len(bursts) != len(arrivals) or any(
+            column is not None and len(column) != len(arrivals) for column in (priorities, names)
+        ):
+            raise CPUSchedBase.COLUMN_LENGTH_MISMATCH_ERROR
+        return cls(sched_factory, cores, ProcessTable.from_arrays(arrivals, bursts, priorities, names).processes, **kwargs)
+
+    @classmethod
+    def from_file(cls, sched_factory: Callable[[], CPUSchedBase], cores: int, path: str, **kwargs) -> "SMPSched":
+        columns = workload_io.read_workload(path)
+        return cls.from_arrays(sched_factory, cores, columns.arrivals, columns.bursts, columns.priorities, columns.names, **kwargs)
+
+    def load_many(self, processes: Iterable[Process]) -> None:
+        new_procs = list(processes)
+        for process_id, process in enumerate(new_procs, len(self.__process_ids)):
+            process.process_id = process_id
+            self.__process_ids[process] = process_id
+        new_procs.sort(key=lambda x: x.arrival)
+        if self.__procs:
+            new_procs = sorted(self.__procs + new_procs, key=lambda x: x.arrival)
+        self.__procs = new_procs
+        self.__has_executed = False
+
+    def insert_process(self, process: Process) -> None:
+        self.load_many([process])
+
+    @property
+    def name(self) -> str:
+        return f"{self.__core_scheds[0].name} ({self.cores} cores)"
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {**self.__core_scheds[0].params, "cores": self.cores, "placement": self.placement}
+
+    @property
+    def processes_list(self) -> List[Process]:
+        return self.__procs
+
+    @property
+    def core_scheds(self) -> List[CPUSchedBase]:
+        return self.__core_scheds
+
+    @property
+    def current_time(self) -> int:
+        return self.__time
+
+    def __place(self) -> List[List[Process]]:
+        partitions: List[List[Process]] = [[] for _ in range(self.cores)]
+        if self.placement == "round_robin":
+            for i, process in enumerate(self.__procs):
+                partitions[i % self.cores].append(process)
+            return partitions
+        # (time the core runs out of placed work, core); a core's backlog at t is max(0, drain - t)
+        drains = [(0, core) for core in range(self.cores)]
+        heapreplace = heapq.heapreplace
+        for process in self.__procs:
+            drain, core = drains[0]
+            arrival = process.arrival
+            heapreplace(drains, ((drain if drain > arrival else arrival) + process.burst, core))
+            partitions[core].append(process)
+        return partitions
+
+    def execute(self, record_timeline: bool = True, distributions: Optional[bool] = None) -> None:
+        partitions = self.__place()
+        self.__core_scheds = [self.sched_factory() for _ in range(self.cores)]
+        self.__core_of = {}
+        self.__metrics = RunMetrics()
+        for core, (sched, partition) in enumerate(zip(self.__core_scheds, partitions)):
+            sched.load_many(partition)
+            sched.execute(record_timeline, distributions=distributions)
+            self.__metrics.merge(sched.metrics)
+            for process in partition:
+                self.__core_of[process] = core
+        # each core numbers its processes for its own tie-breaks; the load ids are put back
+        for process, process_id in self.__process_ids.items():
+            process.process_id = process_id
+        self.__time = max(sched.current_time for sched in self.__core_scheds)
+        self.__has_executed = True
+
+    def __check_executed(self) -> None:
+        if not self.__has_executed:
+            raise SMPSched.NOT_EXECUTED_ERROR
+
+    def core_of(self, process: Process) -> int:
+        self.__check_executed()
+        return self.__core_of[process]
+
+    @property
+    def core_timelines(self) -> List[ProcessTimeline]:
+        self.__check_executed()
+        return [sched.proc_timeline for sched in self.__core_scheds]
+
+    @property
+    def metrics(self) -> RunMetrics:
+        self.__check_executed()
+        return self.__metrics
+
+    @property
+    def process_stats(self) -> "ProcessStats":
+        self.__check_executed()
+        from process_stats import ProcessStats
+        return ProcessStats.from_processes(self.__procs)
+
+    @property
+    def core_utilization(self) -> List[float]:
+        # busy share of each core over the whole run, so idle tails after a core finishes count
+        self.__check_executed()
+        return [sched.metrics.busy_time / self.__time if self.__time else 0.0 for sched in self.__core_scheds]
+
+    @property
+    def cpu_utilization(self) -> float:
+        self.__check_executed()
+        return self.__metrics.busy_time / (self.cores * self.__time) if self.__time else 0.0
+
+    @property
+    def avg_turnaround_time(self) -> float:
+        self.__check_executed()
+        return self.__metrics.turnaround.mean
+
+    @property
+    def avg_waiting_time(self) -> float:
+        self.__check_executed()
+        return self.__metrics.waiting.mean
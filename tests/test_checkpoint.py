@@ -0,0 +1,55 @@
+import pytest
+
+import cpu_sched_algos as algos
+from cpu_sched_base import CPUSchedBase
+from workloads import make_processes, random_workloads, snapshot
+
+
+def sched_factories():
+    yield lambda procs: algos.FCFSSched(procs)
+    yield lambda procs: algos.SRTFSched(procs)
+    yield lambda procs: algos.RRSched(3, procs)
+    yield lambda procs: algos.PPSched(procs)
+    yield lambda procs: algos.MLFQSched(procs, boost_interval=40, aging_threshold=15)
+
+
+@pytest.mark.parametrize("factory", list(sched_factories()))
+def test_paused_and_forked_runs_match_a_straight_run(factory):
+    for workload in random_workloads(21, 15):
+        reference = factory(make_processes(workload))
+        reference.execute()
+        midpoint = reference.current_time // 2
+        sched = factory(make_processes(workload))
+        sched.execute(until=midpoint)
+        if sched.current_time == reference.current_time:
+            # the run finished within the update that crosses the midpoint
+            continue
+        checkpoint = sched.checkpoint()
+        fork = sched.fork(checkpoint)
+        sched.resume()
+        fork.resume()
+        assert snapshot(sched) == snapshot(reference)
+        assert snapshot(fork) == snapshot(reference)
+        sched.restore(checkpoint)
+        sched.resume()
+        assert snapshot(sched) == snapshot(reference)
+
+
+def test_many_chained_forks_keep_the_timeline():
+    workload = random_workloads(22, 1, max_size=300)[0]
+    reference = algos.RRSched(2, make_processes(workload))
+    reference.execute()
+    sched = algos.RRSched(2, make_processes(workload))
+    sched.execute(until=0)
+    for until in range(1, reference.current_time, max(1, reference.current_time // 200)):
+        sched = sched.fork()
+        sched.resume(until)
+    sched.resume()
+    assert snapshot(sched) == snapshot(reference)
+
+
+def test_resume_needs_a_paused_run():
+    sched = algos.FCFSSched(make_processes([(0, 1, 0)]))
+    with pytest.raises(RuntimeError) as error:
+        sched.resume()
+    assert error.value is CPUSchedBase.NOT_PAUSED_ERROR
@@ -0,0 +1,44 @@
+import copy
+
+import cpu_sched_algos as algos
+from process import Process, ProcessTable
+
+
+class TaggedProcess(Process):
+    __slots__ = ("tag",)
+
+    def __init__(self, name, arrival, burst, tag):
+        super().__init__(name, arrival, burst)
+        self.tag = tag
+
+
+def test_standalone_process_has_its_own_table():
+    process = Process("P1", 2, 5, 1)
+    assert len(process.table) == 1
+    assert process.table.processes == [process]
+    assert (process.name, process.arrival, process.burst, process.priority) == ("P1", 2, 5, 1)
+
+
+def test_loading_standalone_processes_keeps_their_identity_and_class():
+    processes = [TaggedProcess(f"P{i}", i, 2, tag=i * 10) for i in range(5)]
+    sched = algos.FCFSSched(processes)
+    assert all(process.table is processes[0].table for process in processes)
+    sched.execute()
+    assert [type(process) for process in sched.processes_list] == [TaggedProcess] * 5
+    assert [(process.tag, process.end) for process in processes] == [(i * 10, i * 2 + 2) for i in range(5)]
+
+
+def test_loading_keeps_shared_tables_in_place():
+    table = ProcessTable.from_arrays([0, 1, 2], [1, 1, 1])
+    sched = algos.SJFSched(table.processes[:2])
+    sched.execute()
+    assert all(process.table is table for process in table.processes)
+    assert [process.end for process in table.processes] == [1, 2, -1]
+
+
+def test_deepcopy_keeps_subclass_and_attributes():
+    process = TaggedProcess("P1", 0, 3, tag="io")
+    copied = copy.deepcopy(process)
+    assert type(copied) is TaggedProcess
+    assert copied is not process and copied.table is not process.table
+    assert (copied.name, copied.burst, copied.tag) == ("P1", 3, "io")
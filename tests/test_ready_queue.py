@@ -0,0 +1,160 @@
+from bisect import insort
+from typing import Any, Callable, List, Optional, Tuple
+import random
+
+import pytest
+
+import cpu_sched_algos as algos
+from process import Process
+from ready_queue import FifoReadyQueue, HeapReadyQueue, PairingHeapReadyQueue, ReadyQueue
+from workloads import make_processes, random_workloads, snapshot
+
+
+class SortedListReadyQueue(ReadyQueue):
+    # the bisect.insort list the schedulers used before the heaps, removing eagerly
+    def __init__(self, key: Callable[[Process], Any]) -> None:
+        super().__init__(key)
+        self.__entries: List[Tuple[Any, int, Process]] = []
+
+    def __push(self, process: Process, seq: int) -> None:
+        self._live[process] = seq
+        insort(self.__entries, (self._key(process), seq, process), key=lambda entry: entry[:2])
+
+    def push(self, process: Process) -> None:
+        self.__push(process, self._next_seq())
+
+    def push_front(self, process: Process) -> None:
+        self.__push(process, self._next_front_seq())
+
+    def remove(self, process: Process) -> None:
+        seq = self._live.pop(process, None)
+        if seq is None:
+            raise ReadyQueue.NOT_QUEUED_ERROR
+        self.__entries = [entry for entry in self.__entries if entry[1] != seq]
+
+    def pop(self) -> Process:
+        if not self.__entries:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        process = self.__entries.pop(0)[2]
+        del self._live[process]
+        return process
+
+    def peek(self) -> Process:
+        if not self.__entries:
+            raise ReadyQueue.EMPTY_QUEUE_ERROR
+        return self.__entries[0][2]
+
+    def clear(self) -> None:
+        super().clear()
+        self.__entries.clear()
+
+
+HEAP_QUEUES = [HeapReadyQueue, PairingHeapReadyQueue]
+
+
+def apply(queue: ReadyQueue, op: str, process: Optional[Process]) -> Any:
+    try:
+        if op == "push":
+            queue.push(process)
+        elif op == "push_front":
+            queue.push_front(process)
+        elif op == "remove":
+            queue.remove(process)
+        elif op == "clear":
+            queue.clear()
+        else:
+            return getattr(queue, op)().name
+    except (IndexError, ValueError) as error:
+        return type(error)
+    return len(queue), process in queue if process is not None else None
+
+
+@pytest.mark.parametrize("queue_type", HEAP_QUEUES)
+@pytest.mark.parametrize("seed", range(20))
+def test_random_operations_match_sorted_list(queue_type, seed):
+    rng = random.Random(seed)
+    processes = [Process(f"P{i}", 0, 1, rng.randint(0, 4)) for i in range(30)]
+    reference = SortedListReadyQueue(lambda x: x.priority)
+    queue = queue_type(lambda x: x.priority)
+    for _ in range(400):
+        op = rng.choices(["push", "push_front", "pop", "peek", "remove", "clear"], [6, 2, 4, 2, 2, 0.1])[0]
+        queued = [process for process in processes if process in reference]
+        if op in ("push", "push_front"):
+            # a process is only ever queued once
+            idle = [process for process in processes if process not in reference]
+            if not idle:
+                continue
+            process = rng.choice(idle)
+        elif op == "remove":
+            process = rng.choice(queued or processes)
+        else:
+            process = None
+        assert apply(queue, op, process) == apply(reference, op, process)
+        assert len(queue) == len(reference)
+
+
+@pytest.mark.parametrize("queue_type", [FifoReadyQueue, *HEAP_QUEUES])
+def test_empty_queue_errors(queue_type):
+    queue = queue_type(lambda x: x.priority)
+    with pytest.raises(IndexError):
+        queue.pop()
+    with pytest.raises(IndexError):
+        queue.peek()
+    with pytest.raises(ValueError):
+        queue.remove(Process("P1", 0, 1))
+
+
+@pytest.mark.parametrize("queue_type", HEAP_QUEUES)
+def test_ties_break_fifo_and_push_front_wins(queue_type):
+    processes = [Process(f"P{i}", 0, 1, 0) for i in range(4)]
+    queue = queue_type(lambda x: x.priority)
+    for process in processes[:3]:
+        queue.push(process)
+    queue.push_front(processes[3])
+    assert [queue.pop().name for _ in range(4)] == ["P3", "P0", "P1", "P2"]
+
+
+def sched_factories():
+    yield "SJF", lambda procs, queue: algos.SJFSched(procs, queue)
+    yield "SRTF", lambda procs, queue: algos.SRTFSched(procs, queue)
+    yield "PNP", lambda procs, queue: algos.PNPSched(procs, queue)
+    yield "PP", lambda procs, queue: algos.PPSched(procs, queue)
+    yield "MLQ", lambda procs, queue: algos.MLQSched(procs, ready_queue_type=queue)
+    yield "MLFQ", lambda procs, queue: algos.MLFQSched(procs, boost_interval=50, aging_threshold=20, ready_queue_type=queue)
+
+
+@pytest.mark.parametrize("seed,factory", [(seed, factory) for seed, (_, factory) in enumerate(sched_factories())], ids=[name for name, _ in sched_factories()])
+def test_schedules_match_sorted_list_queue(seed, factory):
+    for workload in random_workloads(seed, 30):
+        reference = factory(make_processes(workload), SortedListReadyQueue)
+        reference.execute()
+        for queue_type in HEAP_QUEUES:
+            sched = factory(make_processes(workload), queue_type)
+            sched.execute()
+            assert snapshot(sched) == snapshot(reference)
+
+
+def brute_force_nonpreemptive(workload, key) -> List[Tuple[str, int, int]]:
+    # picks the smallest key among arrived processes, ties going to the earliest arrival then input order
+    pending = sorted(range(len(workload)), key=lambda i: workload[i][0])
+    time = 0
+    rows = []
+    while pending:
+        ready = [i for i in pending if workload[i][0] <= time]
+        if not ready:
+            time = min(workload[i][0] for i in pending)
+            continue
+        chosen = min(ready, key=lambda i: (key(workload[i]), pending.index(i)))
+        pending.remove(chosen)
+        rows.append((f"P{chosen + 1}", time, time + workload[chosen][1]))
+        time += workload[chosen][1]
+    return sorted(rows)
+
+
+@pytest.mark.parametrize("queue_type", HEAP_QUEUES)
+@pytest.mark.parametrize("sched_type,key", [(algos.SJFSched, lambda row: row[1]), (algos.PNPSched, lambda row: row[2])], ids=["SJF", "PNP"])
+def test_nonpreemptive_schedules_match_brute_force(queue_type, sched_type, key):
+    for workload in random_workloads(5, 40):
+        sched = sched_type(make_processes(workload), queue_type)
+        sched.execute()
+        assert snapshot(sched)[1] == brute_force_nonpreemptive(workload, key)
@@ -0,0 +1,56 @@
+import os
+from array import array
+
+import pytest
+
+import cpu_sched_algos as algos
+from result_cache import CachedResult, ResultCache
+from workloads import make_processes, random_workloads, snapshot
+
+
+def test_cached_result_round_trips():
+    result = CachedResult(array('q', [0, 3]), array('q', [3, 5]), 5, b"\x01\x02")
+    assert CachedResult.from_bytes(result.to_bytes()) == result
+    result.timeline = None
+    assert CachedResult.from_bytes(result.to_bytes()) == result
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00" * 23, CachedResult(array('q', [1]), array('q', [2]), 2).to_bytes()[:-1]])
+def test_truncated_entries_are_rejected(data):
+    with pytest.raises(ValueError) as error:
+        CachedResult.from_bytes(data)
+    assert error.value is CachedResult.CORRUPT_ENTRY_ERROR
+
+
+@pytest.mark.parametrize("factory", [lambda procs: algos.SRTFSched(procs), lambda procs: algos.RRSched(2, procs)])
+def test_hits_reproduce_the_run(tmp_path, factory):
+    for workload in random_workloads(41, 10):
+        reference = factory(make_processes(workload))
+        reference.execute()
+        assert not ResultCache(str(tmp_path)).execute(factory(make_processes(workload)))
+        # a fresh cache on the same directory reads the entry from disk
+        cached = factory(make_processes(workload))
+        assert ResultCache(str(tmp_path)).execute(cached)
+        assert snapshot(cached) == snapshot(reference)
+
+
+def test_corrupt_file_is_a_miss(tmp_path):
+    sched = algos.FCFSSched(make_processes([(0, 2, 0), (1, 1, 0)]))
+    ResultCache(str(tmp_path)).execute(sched)
+    [name] = os.listdir(tmp_path)
+    (tmp_path / name).write_bytes(b"not a result")
+    assert not ResultCache(str(tmp_path)).execute(algos.FCFSSched(make_processes([(0, 2, 0), (1, 1, 0)])))
+
+
+def test_disk_tier_stays_under_its_limit(tmp_path):
+    cache = ResultCache(str(tmp_path), memory_entries=1, max_disk_bytes=2000)
+    for workload in random_workloads(42, 30):
+        cache.execute(algos.SJFSched(make_processes(workload)))
+        assert sum(entry.stat().st_size for entry in os.scandir(tmp_path)) <= 2000
+
+
+def test_limits_must_be_positive():
+    with pytest.raises(ValueError):
+        ResultCache(memory_entries=0)
+    with pytest.raises(ValueError):
+        ResultCache(max_disk_bytes=0)
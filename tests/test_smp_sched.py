@@ -0,0 +1,45 @@
+import pytest
+
+import cpu_sched_algos as algos
+from process import ProcessTable
+from smp_sched import SMPSched
+from workloads import make_processes, random_workloads
+
+
+def test_process_ids_follow_input_order():
+    processes = make_processes([(5, 2, 0), (0, 3, 1), (2, 1, 0), (0, 4, 2)])
+    smp = SMPSched(algos.PNPSched, 2, processes)
+    assert [process.process_id for process in processes] == [0, 1, 2, 3]
+    smp.execute()
+    assert [process.process_id for process in processes] == [0, 1, 2, 3]
+    smp.insert_process(make_processes([(1, 1, 0)])[0])
+    smp.execute()
+    assert sorted(process.process_id for process in smp.processes_list) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("sched_type", [algos.FCFSSched, algos.SJFSched, algos.SRTFSched, algos.PPSched])
+def test_single_core_matches_the_plain_scheduler(sched_type):
+    for workload in random_workloads(31, 20):
+        reference = sched_type(make_processes(workload))
+        reference.execute()
+        smp = SMPSched(sched_type, 1, make_processes(workload))
+        smp.execute()
+        assert [(process.name, process.end) for process in smp.processes_list] == [(process.name, process.end) for process in reference.processes_list]
+        assert smp.avg_waiting_time == pytest.approx(reference.avg_waiting_time)
+
+
+def test_least_work_fcfs_matches_a_global_queue():
+    for workload in random_workloads(32, 20):
+        arrivals, bursts, _ = (list(column) for column in zip(*workload))
+        smp = SMPSched.from_arrays(algos.FCFSSched, 3, arrivals, bursts)
+        smp.execute()
+        # every arrival takes the core that frees up first
+        free = [0, 0, 0]
+        waiting = 0
+        for arrival, burst in sorted(zip(arrivals, bursts), key=lambda row: row[0]):
+            core = free.index(min(free))
+            start = max(free[core], arrival)
+            waiting += start - arrival
+            free[core] = start + burst
+        assert smp.avg_waiting_time == pytest.approx(waiting / len(arrivals))
+        assert sum(process.end - process.start for process in smp.processes_list) == sum(bursts)
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+import batch_runner
+import cpu_sched_algos as algos
+import main
+from smp_sched import SMPSched
+
+
+@pytest.mark.parametrize("interval", [0, -1])
+@pytest.mark.parametrize("argument", ["boost_interval", "aging_threshold"])
+def test_mlfq_rejects_non_positive_intervals(argument, interval):
+    with pytest.raises(ValueError) as error:
+        algos.MLFQSched(**{argument: interval})
+    assert error.value is algos.MLFQSched.INVALID_INTERVAL_ERROR
+
+
+def test_mlfq_accepts_positive_or_missing_intervals():
+    algos.MLFQSched(boost_interval=1, aging_threshold=1)
+    algos.MLFQSched()
+
+
+@pytest.mark.parametrize("policy,time_quantum", [("lottery", 4), ("rr", 0), ("rr", -2)])
+def test_level_config_rejects_bad_levels(policy, time_quantum):
+    with pytest.raises(ValueError):
+        algos.LevelConfig(policy, time_quantum)
+
+
+def test_smp_rejects_non_positive_cores():
+    with pytest.raises(ValueError) as error:
+        SMPSched(algos.FCFSSched, 0)
+    assert error.value is SMPSched.INVALID_CORES_ERROR
+
+
+def run_main(argv, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main.main(argv)
+    assert exit.value.code == 2
+    return capsys.readouterr().err
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("text,message", [
+    ("0,0\n1,2\n", "bursts must be positive"),
+    ("0,-3\n", "bursts must be positive"),
+    ("-1,2\n", "arrivals must not be negative"),
+    ("0,1,2\n1,2\n", "every column must have the same length"),
+    ("arrival,priority\n0,1\n", "at least arrival and burst"),
+    ("0,x\n", "invalid literal"),
+])
+def test_bad_csv_workloads_are_parser_errors(tmp_path, capsys, text, message):
+    path = write(tmp_path, "workload.csv", text)
+    err = run_main(["--batch", "--algo", algos.FCFSSched.name, "--workload", path], capsys)
+    assert f"--workload {path}" in err
+    assert message in err
+
+
+def test_missing_and_unknown_workloads_are_parser_errors(tmp_path, capsys):
+    missing = str(tmp_path / "missing.csv")
+    assert "--workload" in run_main(["--batch", "--algo", algos.FCFSSched.name, "--workload", missing], capsys)
+    unknown = write(tmp_path, "workload.txt", "0,1\n")
+    assert ".csv, .npy or .npz" in run_main(["--batch", "--algo", algos.FCFSSched.name, "--workload", unknown], capsys)
+
+
+def test_bad_numpy_workloads_are_parser_errors(tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "workload.npy")
+    np.save(path, np.array([[0, 1], [2, 0]]))
+    assert "bursts must be positive" in run_main(["--batch", "--algo", algos.SJFSched.name, "--workload", path], capsys)
+    path = str(tmp_path / "workload.npz")
+    np.savez(path, arrival=np.array([0, 1, 2]), burst=np.array([1, 2]))
+    assert "same length" in run_main(["--batch", "--algo", algos.SJFSched.name, "--workload", path], capsys)
+
+
+@pytest.mark.parametrize("extra", [[], ["--compare"], ["--cores", "2"]])
+@pytest.mark.parametrize("quantum", ["0", "-4"])
+def test_non_positive_quantum_is_a_parser_error(capsys, extra, quantum):
+    argv = ["--batch", "--algo", algos.RRSched.name, "--arrival", "0 1", "--burst", "2 3", "--quantum", quantum, *extra]
+    assert "--quantum must be positive" in run_main(argv, capsys)
+
+
+@pytest.mark.parametrize("cores", ["0", "-1"])
+def test_non_positive_cores_is_a_parser_error(capsys, cores):
+    argv = ["--batch", "--algo", algos.FCFSSched.name, "--arrival", "0 1", "--burst", "2 3", "--cores", cores]
+    assert "--cores must be positive" in run_main(argv, capsys)
+
+
+def test_valid_workload_runs(tmp_path, capsys):
+    path = write(tmp_path, "workload.csv", "arrival,burst,priority,name\n0,3,1,A\n1,2,0,B\n")
+    main.main(["--batch", "--algo", algos.PNPSched.name, "--workload", path])
+    report = json.loads(capsys.readouterr().out)
+    assert [process["name"] for process in report["processes"]] == ["A", "B"]
+
+
+@pytest.mark.parametrize("quanta", [["0"], ["2", "0"], ["-1"]])
+def test_batch_runner_rejects_non_positive_quanta(tmp_path, capsys, quanta):
+    path = write(tmp_path, "workload.csv", "0,1\n")
+    with pytest.raises(SystemExit) as exit:
+        batch_runner.main([path, "--quantum", *quanta])
+    assert exit.value.code == 2
+    assert "--quantum must be positive" in capsys.readouterr().err
@@ -0,0 +1,108 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import cpu_sched_algos as algos
+import vectorized_engine
+from cpu_sched_base import CPUSchedBase
+from process import ProcessTable
+from workloads import make_processes, random_workloads, snapshot
+
+
+ENGINE_SCHEDS = [algos.FCFSSched, algos.SJFSched, algos.PNPSched]
+
+
+def brute_force_dispatch(arrivals, bursts, keys):
+    # takes the smallest (key, row) among arrived rows, so zero bursts compete at the instant they are left
+    pending = list(range(len(arrivals)))
+    time = 0
+    order, starts = [], []
+    while pending:
+        ready = [i for i in pending if arrivals[i] <= time]
+        if not ready:
+            time = min(arrivals[i] for i in pending)
+            continue
+        chosen = min(ready, key=lambda i: (keys[i], i))
+        pending.remove(chosen)
+        order.append(chosen)
+        starts.append(time)
+        time += bursts[chosen]
+    return order, starts
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_nonpreemptive_dispatch_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        n = int(rng.integers(1, 25))
+        arrivals = np.sort(rng.integers(0, int(rng.integers(1, 60)), n))
+        bursts = rng.integers(0, 6, n)
+        keys = rng.integers(0, 4, n)
+        order, starts = vectorized_engine.nonpreemptive_dispatch(arrivals, bursts, keys)
+        assert (order.tolist(), starts.tolist()) == brute_force_dispatch(arrivals.tolist(), bursts.tolist(), keys.tolist())
+
+
+def test_fcfs_dispatch_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        n = int(rng.integers(1, 25))
+        arrivals = np.sort(rng.integers(0, 40, n))
+        bursts = rng.integers(0, 6, n)
+        order, starts = vectorized_engine.fcfs_dispatch(arrivals, bursts)
+        assert (order.tolist(), starts.tolist()) == brute_force_dispatch(arrivals.tolist(), bursts.tolist(), [0] * n)
+
+
+@pytest.mark.parametrize("sched_type", ENGINE_SCHEDS)
+def test_engines_agree_on_random_workloads(sched_type):
+    for workload in random_workloads(11, 60):
+        reference = sched_type(make_processes(workload), engine="object")
+        reference.execute()
+        sched = sched_type(make_processes(workload), engine="vectorized")
+        sched.execute()
+        assert snapshot(sched) == snapshot(reference)
+        # a second run on the same scheduler starts over from the loaded processes
+        sched.execute()
+        assert snapshot(sched) == snapshot(reference)
+
+
+@pytest.mark.parametrize("sched_type", ENGINE_SCHEDS)
+def test_engines_agree_across_tables(sched_type):
+    # processes from several tables, and a table loaded only in part
+    for workload in random_workloads(12, 30):
+        arrivals, bursts, priorities = (list(column) for column in zip(*workload))
+        half = len(workload) // 2
+
+        def build(engine):
+            sched = sched_type(ProcessTable.from_arrays(arrivals[:half], bursts[:half], priorities[:half]).processes, engine=engine)
+            rest = ProcessTable.from_arrays(arrivals[half:], bursts[half:], priorities[half:]).processes
+            sched.load_many(rest[::2])
+            return sched
+
+        reference, sched = build("object"), build("vectorized")
+        reference.execute()
+        sched.execute()
+        assert snapshot(sched) == snapshot(reference)
+
+
+@pytest.mark.parametrize("function,sched_type,uses_priority", [
+    (vectorized_engine.fcfs, algos.FCFSSched, False),
+    (vectorized_engine.sjf, algos.SJFSched, False),
+    (vectorized_engine.pnp, algos.PNPSched, True),
+])
+def test_module_functions_match_object_engine(function, sched_type, uses_priority):
+    for workload in random_workloads(13, 40):
+        arrivals, bursts, priorities = (list(column) for column in zip(*workload))
+        result = function(arrivals, bursts, priorities) if uses_priority else function(arrivals, bursts)
+        processes = make_processes(workload)
+        sched = sched_type(processes)
+        sched.execute()
+        assert result.end.tolist() == [process.end for process in processes]
+        assert result.turnaround.mean() == pytest.approx(sched.avg_turnaround_time)
+        assert result.waiting.mean() == pytest.approx(sched.avg_waiting_time)
+        assert result.cpu_utilization == pytest.approx(sched.cpu_utilization)
+
+
+def test_unsupported_engine_is_rejected():
+    with pytest.raises(ValueError) as error:
+        algos.FCFSSched(engine="gpu")
+    assert error.value is CPUSchedBase.UNSUPPORTED_ENGINE_ERROR
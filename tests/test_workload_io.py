@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+import batch_runner
+import cpu_sched_algos as algos
+import workload_io
+
+
+def test_csv_header_may_reorder_columns(tmp_path):
+    path = tmp_path / "workload.csv"
+    path.write_text("name,burst,arrival\nA,3,1\nB,2,0\n")
+    columns = workload_io.read_workload(str(path))
+    assert (list(columns.arrivals), list(columns.bursts), columns.priorities, columns.names) == ([1, 0], [3, 2], None, ["A", "B"])
+
+
+def test_npy_columns_are_contiguous_int64(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "workload.npy")
+    np.save(path, np.array([[0, 4, 2], [1, 3, 0], [1, 1, 1]], dtype=np.int32))
+    columns = workload_io.read_workload(path)
+    for column, expected in ((columns.arrivals, [0, 1, 1]), (columns.bursts, [4, 3, 1]), (columns.priorities, [2, 0, 1])):
+        assert column.dtype == np.int64 and column.flags.c_contiguous
+        assert column.tolist() == expected
+
+
+def test_npz_workload_runs_like_csv(tmp_path):
+    np = pytest.importorskip("numpy")
+    npz = str(tmp_path / "workload.npz")
+    np.savez(npz, arrival=np.array([0, 2, 3]), burst=np.array([5, 1, 2]), priority=np.array([1, 0, 0]))
+    csv = tmp_path / "workload.csv"
+    csv.write_text("0,5,1\n2,1,0\n3,2,0\n")
+    runs = []
+    for path in (npz, str(csv)):
+        sched = algos.PPSched.from_file(path)
+        sched.execute()
+        runs.append([process.end for process in sched.processes_list])
+    assert runs[0] == runs[1]
+
+
+def test_sweep_csv_uses_newlines(tmp_path):
+    path = tmp_path / "workload.csv"
+    path.write_text("0,3\n1,2\n")
+    results = batch_runner.run_sweep({str(path): workload_io.read_workload(str(path))}, [algos.FCFSSched, algos.RRSched], (1, 2), max_workers=1)
+    stream = io.StringIO(newline="")
+    batch_runner.write_results(results, stream)
+    output = stream.getvalue()
+    assert "\r" not in output
+    assert len(output.splitlines()) == 1 + 3
@@ -0,0 +1,32 @@
+from typing import List, Tuple
+import random
+
+from process import Process
+
+
+Workload = List[Tuple[int, int, int]]
+
+
+def random_workloads(seed: int, count: int, max_size: int = 40) -> List[Workload]:
+    # mixes tight and sparse arrivals, short and long bursts, and few or many priorities
+    rng = random.Random(seed)
+    workloads = []
+    for _ in range(count):
+        spread = rng.choice([0, 3, 10, 50, 300])
+        longest = rng.choice([3, 10, 40])
+        priorities = rng.choice([1, 3, 10])
+        workloads.append([
+            (rng.randint(0, spread), rng.randint(1, longest), rng.randint(0, priorities))
+            for _ in range(rng.randint(1, max_size))
+        ])
+    return workloads
+
+
+def make_processes(workload: Workload) -> List[Process]:
+    return [Process(f"P{i + 1}", arrival, burst, priority) for i, (arrival, burst, priority) in enumerate(workload)]
+
+
+def snapshot(sched) -> tuple:
+    timeline = [(task.process.name if task.process else None, task.start, task.end) for task in sched.proc_timeline]
+    ends = [(process.name, process.start, process.end) for process in sched.processes_list]
+    return timeline, sorted(ends), sched.avg_turnaround_time, sched.avg_waiting_time, sched.cpu_utilization
@@ -0,0 +1,150 @@
+from abc import ABC, abstractmethod
+from array import array
+from typing import List, Optional, Sequence, Tuple
+import csv
+import json
+import mmap
+import os
+
+from process import Process
+
+# (process or None for idle, start, end)
+SliceRow = Tuple[Optional[Process], int, int]
+
+
+class TimelineSink(ABC):
+    # Receives timeline slices while a scheduler runs and writes them out in
+    # batches. Slices are coalesced the same way ProcessTimeline coalesces them,
+    # so the last slice is held back until the next one shows it is complete.
+    INVALID_BATCH_ERROR = ValueError("batch_rows must be positive")
+
+    def __init__(self, batch_rows: int = 65536) -> None:
+        if batch_rows <= 0:
+            raise TimelineSink.INVALID_BATCH_ERROR
+        self.batch_rows = batch_rows
+        self.rows_written: int = 0
+        self.__rows: List[SliceRow] = []
+        self.__pending: Optional[SliceRow] = None
+
+    def add_task(self, process: Optional[Process], start: int, end: int) -> None:
+        pending = self.__pending
+        if pending is not None:
+            if pending[0] is process and pending[2] == start:
+                self.__pending = (process, pending[1], end)
+                return
+            self.__rows.append(pending)
+            if len(self.__rows) >= self.batch_rows:
+                self.__write_batch()
+        self.__pending = (process, start, end)
+
+    def add_cycle(self, processes: Sequence[Process], start: int, slice_length: int, repeats: int) -> None:
+        add_task = self.add_task
+        for _ in range(repeats):
+            for process in processes:
+                add_task(process, start, start + slice_length)
+                start += slice_length
+
+    def __write_batch(self) -> None:
+        if self.__rows:
+            self._write_rows(self.__rows)
+            self.rows_written += len(self.__rows)
+            self.__rows = []
+
+    def flush(self, final: bool = False) -> None:
+        # final also writes the held-back last slice; the scheduler passes it once a run completes
+        if final and self.__pending is not None:
+            self.__rows.append(self.__pending)
+            self.__pending = None
+        self.__write_batch()
+        self._flush()
+
+    def close(self) -> None:
+        self.flush(final=True)
+        self._close()
+
+    def __enter__(self) -> "TimelineSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @abstractmethod
+    def _write_rows(self, rows: List[SliceRow]) -> None:
+        pass
+
+    def _flush(self) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+
+class BinaryTimelineSink(TimelineSink):
+    # Append-only file of fixed-width records: process_id, start and end as
+    # native-endian int64, with -1 for idle. read_binary_timeline maps it back.
+    def __init__(self, path: str, batch_rows: int = 65536) -> None:
+        super().__init__(batch_rows)
+        self.__file = open(path, "ab")
+
+    def _write_rows(self, rows: List[SliceRow]) -> None:
+        records = array('q')
+        for process, start, end in rows:
+            records.extend((process.process_id if process is not None else -1, start, end))
+        self.__file.write(records)
+
+    def _flush(self) -> None:
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
+
+
+def read_binary_timeline(path: str) -> memoryview:
+    # a zero-copy int64 view of a BinaryTimelineSink file; record i is view[3 * i:3 * i + 3]
+    if os.path.getsize(path) == 0:
+        return memoryview(array('q'))
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast('q')
+
+
+class JsonLinesTimelineSink(TimelineSink):
+    # one {"process", "start", "end"} object per line, with a null process for idle
+    def __init__(self, path: str, batch_rows: int = 65536) -> None:
+        super().__init__(batch_rows)
+        self.__file = open(path, "a", encoding="utf-8")
+
+    def _write_rows(self, rows: List[SliceRow]) -> None:
+        dumps = json.dumps
+        self.__file.write("".join(
+            f'{{"process": {dumps(process.name) if process is not None else "null"}, "start": {start}, "end": {end}}}\n'
+            for process, start, end in rows
+        ))
+
+    def _flush(self) -> None:
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
+
+
+class CsvTimelineSink(TimelineSink):
+    # process,start,end rows under a header, with an empty process for idle
+    def __init__(self, path: str, batch_rows: int = 65536) -> None:
+        super().__init__(batch_rows)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.__file = open(path, "a", encoding="utf-8", newline="")
+        self.__writer = csv.writer(self.__file, lineterminator="\n")
+        if is_new:
+            self.__writer.writerow(("process", "start", "end"))
+
+    def _write_rows(self, rows: List[SliceRow]) -> None:
+        self.__writer.writerows(
+            (process.name if process is not None else "", start, end) for process, start, end in rows
+        )
+
+    def _flush(self) -> None:
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
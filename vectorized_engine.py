@@ -0,0 +1,110 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+import heapq
+
+import numpy as np
+
+
+@dataclass
+class ScheduleResult:
+    end: np.ndarray
+    turnaround: np.ndarray
+    waiting: np.ndarray
+
+    @property
+    def cpu_utilization(self) -> float:
+        return float((self.turnaround - self.waiting).sum() / self.end.max())
+
+
+# The dispatch functions take arrival-sorted columns and return the dispatch order
+# (indices into those columns) together with the start time of each dispatch.
+
+def fcfs_dispatch(arrivals: np.ndarray, bursts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    arrivals = np.asarray(arrivals, dtype=np.int64)
+    bursts = np.asarray(bursts, dtype=np.int64)
+    # start_i = max(end_{i-1}, arrival_i), unrolled into a running max over arrival minus prior work
+    prior_work = np.cumsum(bursts) - bursts
+    starts = np.maximum.accumulate(arrivals - prior_work) + prior_work
+    return np.arange(len(arrivals), dtype=np.int64), starts
+
+
+def nonpreemptive_dispatch(arrivals: np.ndarray, bursts: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    arrivals = np.asarray(arrivals, dtype=np.int64)
+    bursts = np.asarray(bursts, dtype=np.int64)
+    keys = np.asarray(keys)
+    # Busy periods do not depend on the order inside them, so the FCFS recurrence finds
+    # them. A period only starts once all prior work ended strictly before the arrival,
+    # since a zero burst left at that instant would still compete. A process alone in
+    # its period starts at its arrival as it does under FCFS.
+    order, starts = fcfs_dispatch(arrivals, bursts)
+    firsts = np.flatnonzero(np.concatenate(([True], starts[:-1] + bursts[:-1] < arrivals[1:])))
+    sizes = np.diff(firsts, append=len(arrivals))
+    # In a pair the second process only goes first if it arrived with the first one
+    # and has the smaller key.
+    pairs = firsts[sizes == 2]
+    swapped = pairs[(arrivals[pairs + 1] == arrivals[pairs]) & (keys[pairs + 1] < keys[pairs])]
+    order[swapped] = swapped + 1
+    order[swapped + 1] = swapped
+    starts[swapped + 1] = starts[swapped] + bursts[swapped + 1]
+    # the longer periods go through the heap, over just their own rows
+    in_heap = np.repeat(sizes > 2, sizes)
+    rows = np.flatnonzero(in_heap)
+    if not len(rows):
+        return order, starts
+    heap_sizes = sizes[sizes > 2]
+    lasts = np.cumsum(heap_sizes)
+    arrival_list = arrivals[rows].tolist()
+    burst_list = bursts[rows].tolist()
+    key_list = keys[rows].tolist()
+    dispatched = []
+    dispatch_starts = []
+    for first, last in zip((lasts - heap_sizes).tolist(), lasts.tolist()):
+        ready = []
+        time = arrival_list[first]
+        next_index = first
+        for _ in range(first, last):
+            arrived = bisect_right(arrival_list, time, next_index, last)
+            if arrived - next_index > len(ready):
+                # a large batch of arrivals is cheaper to heapify than to push one at a time
+                ready.extend(zip(key_list[next_index:arrived], range(next_index, arrived)))
+                heapq.heapify(ready)
+            else:
+                for index in range(next_index, arrived):
+                    heapq.heappush(ready, (key_list[index], index))
+            next_index = arrived
+            index = heapq.heappop(ready)[1]
+            dispatched.append(index)
+            dispatch_starts.append(time)
+            time += burst_list[index]
+    order[in_heap] = rows[dispatched]
+    starts[in_heap] = dispatch_starts
+    return order, starts
+
+
+def _schedule(arrivals: Sequence[int], bursts: Sequence[int], keys: Optional[Sequence[int]]) -> ScheduleResult:
+    arrivals = np.asarray(arrivals, dtype=np.int64)
+    bursts = np.asarray(bursts, dtype=np.int64)
+    by_arrival = np.argsort(arrivals, kind="stable")
+    sorted_arrivals = arrivals[by_arrival]
+    sorted_bursts = bursts[by_arrival]
+    if keys is None:
+        order, starts = fcfs_dispatch(sorted_arrivals, sorted_bursts)
+    else:
+        order, starts = nonpreemptive_dispatch(sorted_arrivals, sorted_bursts, np.asarray(keys)[by_arrival])
+    end = np.empty_like(arrivals)
+    end[by_arrival[order]] = starts + sorted_bursts[order]
+    turnaround = end - arrivals
+    return ScheduleResult(end, turnaround, turnaround - bursts)
+
+
+def fcfs(arrivals: Sequence[int], bursts: Sequence[int]) -> ScheduleResult:
+    return _schedule(arrivals, bursts, None)
+
+
+def sjf(arrivals: Sequence[int], bursts: Sequence[int]) -> ScheduleResult:
+    return _schedule(arrivals, bursts, bursts)
+
+
+def pnp(arrivals: Sequence[int], bursts: Sequence[int], priorities: Sequence[int]) -> ScheduleResult:
+    return _schedule(arrivals, bursts, priorities)
@@ -0,0 +1,58 @@
+from typing import Optional
+
+import numpy as np
+
+from workload_io import WorkloadColumns
+
+ARRIVAL_MODELS = ("poisson", "bursty")
+BURST_MODELS = ("exponential", "pareto", "uniform")
+PRIORITY_MODELS = ("uniform", "zipf")
+
+UNKNOWN_MODEL_ERROR = ValueError("unknown workload model")
+
+
+def generate_workload(
+    n: int,
+    seed: Optional[int] = None,
+    arrival: str = "poisson",
+    arrival_rate: float = 0.2,
+    burst_size: int = 20,
+    burst: str = "exponential",
+    mean_burst: float = 5.0,
+    pareto_shape: float = 1.5,
+    priority: str = "uniform",
+    priority_levels: int = 8,
+) -> WorkloadColumns:
+    # arrival_rate is in processes per time unit; bursty arrivals come in groups
+    # of about burst_size processes sharing one arrival time
+    if arrival not in ARRIVAL_MODELS or burst not in BURST_MODELS or priority not in PRIORITY_MODELS:
+        raise UNKNOWN_MODEL_ERROR
+    rng = np.random.default_rng(seed)
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return WorkloadColumns(empty, empty.copy(), empty.copy())
+
+    if arrival == "poisson":
+        gaps = rng.exponential(1 / arrival_rate, n)
+        arrivals = np.floor(np.cumsum(gaps)).astype(np.int64)
+    else:
+        groups = rng.geometric(1 / burst_size, n)
+        group_starts = np.floor(np.cumsum(rng.exponential(burst_size / arrival_rate, n))).astype(np.int64)
+        arrivals = np.repeat(group_starts, groups)[:n]
+    arrivals -= arrivals[0]
+
+    if burst == "exponential":
+        bursts = np.ceil(rng.exponential(mean_burst, n))
+    elif burst == "pareto":
+        scale = mean_burst * (pareto_shape - 1) / pareto_shape if pareto_shape > 1 else mean_burst
+        bursts = np.ceil((rng.pareto(pareto_shape, n) + 1) * scale)
+    else:
+        bursts = rng.integers(1, 2 * int(mean_burst), n, endpoint=True)
+    bursts = np.maximum(bursts, 1).astype(np.int64)
+
+    if priority == "uniform":
+        priorities = rng.integers(0, priority_levels, n)
+    else:
+        priorities = np.minimum(rng.zipf(2.0, n) - 1, priority_levels - 1)
+
+    return WorkloadColumns(arrivals, bursts, priorities.astype(np.int64))
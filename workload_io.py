@@ -0,0 +1,128 @@
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import mmap
+import os
+
+from process import Process
+
+
+@dataclass
+class WorkloadColumns:
+    arrivals: Sequence[int]
+    bursts: Sequence[int]
+    priorities: Optional[Sequence[int]] = None
+    names: Optional[Sequence[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.arrivals)
+
+
+CSV_COLUMNS = ("arrival", "burst", "priority", "name")
+UNKNOWN_FORMAT_ERROR = ValueError("workload files must be .csv, .npy or .npz")
+MISSING_COLUMN_ERROR = ValueError("workload must have at least arrival and burst columns")
+
+
+def _csv_lines(path: str) -> Iterator[bytes]:
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from iter(mapped.readline, b"")
+
+
+def _csv_rows(lines: Iterable[bytes]) -> Iterator[Tuple[Sequence[str], List[bytes]]]:
+    # yields (column order, fields) for each data row, consuming the optional header
+    order: Sequence[str] = CSV_COLUMNS
+    first = True
+    for line in lines:
+        fields = [field.strip() for field in line.split(b",")]
+        if not fields or fields == [b""]:
+            continue
+        if first:
+            first = False
+            if not fields[0].lstrip(b"-").isdigit():
+                order = [field.decode().lower() for field in fields]
+                if "arrival" not in order or "burst" not in order:
+                    raise MISSING_COLUMN_ERROR
+                continue
+        yield order, fields
+
+
+# rows are arrival,burst[,priority[,name]]; an optional header may name the columns in any order
+def read_csv(path: str) -> WorkloadColumns:
+    return read_csv_stream(_csv_lines(path))
+
+
+# same format as read_csv, from any binary stream or iterable of lines such as sys.stdin.buffer
+def read_csv_stream(lines: Iterable[bytes]) -> WorkloadColumns:
+    columns = {"arrival": array('q'), "burst": array('q'), "priority": array('q')}
+    names: List[str] = []
+    for order, fields in _csv_rows(lines):
+        for column, field in zip(order, fields):
+            if column == "name":
+                names.append(field.decode())
+            elif column in columns:
+                columns[column].append(int(field))
+    if len(columns["burst"]) != len(columns["arrival"]):
+        raise MISSING_COLUMN_ERROR
+    return WorkloadColumns(
+        columns["arrival"],
+        columns["burst"],
+        columns["priority"] or None,
+        names or None,
+    )
+
+
+# one Process per row, read lazily so a trace can be fed to CPUSchedBase.execute_online
+def iter_csv_processes(path: str) -> Iterator[Process]:
+    for i, (order, fields) in enumerate(_csv_rows(_csv_lines(path))):
+        row = dict(zip(order, fields))
+        if "arrival" not in row or "burst" not in row:
+            raise MISSING_COLUMN_ERROR
+        yield Process(
+            row["name"].decode() if "name" in row else f"P{i+1}",
+            int(row["arrival"]),
+            int(row["burst"]),
+            int(row.get("priority", 0)),
+        )
+
+
+def _contiguous_int64(values: Sequence[int]) -> Sequence[int]:
+    # a column of the memory-mapped matrix is a strided view, so it is gathered into
+    # one contiguous int64 array that ProcessTable can copy in bulk
+    import numpy as np
+
+    return np.ascontiguousarray(values, dtype=np.int64)
+
+
+# .npy holds an (n, 2|3) matrix of arrival, burst[, priority]; .npz holds arrays named like the CSV columns
+def read_numpy(path: str) -> WorkloadColumns:
+    import numpy as np
+
+    if path.endswith(".npz"):
+        with np.load(path) as archive:
+            if "arrival" not in archive or "burst" not in archive:
+                raise MISSING_COLUMN_ERROR
+            return WorkloadColumns(
+                _contiguous_int64(archive["arrival"]),
+                _contiguous_int64(archive["burst"]),
+                _contiguous_int64(archive["priority"]) if "priority" in archive else None,
+                archive["name"].astype(str).tolist() if "name" in archive else None,
+            )
+    matrix = np.load(path, mmap_mode="r")
+    if matrix.ndim != 2 or matrix.shape[1] < 2:
+        raise MISSING_COLUMN_ERROR
+    return WorkloadColumns(
+        _contiguous_int64(matrix[:, 0]),
+        _contiguous_int64(matrix[:, 1]),
+        _contiguous_int64(matrix[:, 2]) if matrix.shape[1] > 2 else None,
+    )
+
+
+def read_workload(path: str) -> WorkloadColumns:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return read_csv(path)
+    if extension in (".npy", ".npz"):
+        return read_numpy(path)
+    raise UNKNOWN_FORMAT_ERROR